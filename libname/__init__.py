@@ -1 +1,4 @@
-from buttons import Button, ButtonBox, EmbeddedButtonBox, ButtonAppearance, ButtonBackgroundAppearance
+from buttons import (Button, ButtonBox, EmbeddedButtonBox, ButtonBoxManager, ButtonAppearance,
+                     ButtonBackgroundAppearance, SurfaceCache, SurfaceAtlas, SurfacePool, BoxStatistics,
+                     FrameStatistics, CommandExecutor, ScrollableButtonArrangement,
+                     ButtonState, cache_appearance_applied_buttons, get_finger_position)
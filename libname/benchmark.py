@@ -0,0 +1,311 @@
+"""
+headless benchmarks for the rendering and input paths of the buttons module
+
+usage: python benchmark.py [--grid-sizes 4 16 32] [--frames 300] [--output results.json] [--compare old_results.json]
+
+the benchmarks run with the dummy SDL video driver, so neither a window nor a mouse is needed. Every benchmark reports
+its throughput and percentiles of the measured frame times, the results can be saved as json and compared with the
+results of an earlier run to find regressions
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import time
+import typing
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+import buttons
+from buttons import (BaseButton, ButtonAppearance, ButtonArrangement, ButtonBackgroundAppearance, ButtonBox,
+                     EmbeddedButtonBox, SurfaceCache)
+from timings import summarise
+
+
+def measure(function: typing.Callable[[int], typing.Any],
+            runs: int,
+            setup: typing.Callable[[int], typing.Any] = None) -> list[float]:
+    """
+    measure the duration of every single call of a function
+    :param function: function to be measured, it is called with the number of the current run
+    :param runs: number of calls
+    :param setup: function called with the number of the current run before every measured call (not measured)
+    :return: list of durations in seconds
+    """
+    timings = []
+    for run in range(runs):
+        if setup is not None:
+            setup(run)
+        start = time.perf_counter()
+        function(run)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def generate_texture(seed: int, size: int = 128) -> pygame.Surface:
+    """
+    generate a deterministic texture with varying colour and alpha
+    :param seed: seed for the texture colours
+    :param size: edge length of the texture
+    :return: texture with per pixel alpha
+    """
+    gradient = np.linspace(0, 255, size, dtype=np.uint8)
+    rng = np.random.default_rng(seed)
+    texture = pygame.Surface((size, size)).convert_alpha()
+    pixels = pygame.surfarray.pixels3d(texture)
+    pixels[...] = rng.integers(0, 256, 3, dtype=np.uint8)
+    pixels[..., seed % 3] = gradient[:, None]
+    del pixels
+    alpha = pygame.surfarray.pixels_alpha(texture)
+    alpha[...] = gradient[None, :]
+    del alpha
+    return texture
+
+
+def generate_appearances() -> dict[str, ButtonAppearance]:
+    """
+    get the appearances used by the benchmarks, similar to the ones of the example in the buttons module
+    :return: appearance for every state keyword argument of BaseButton
+    """
+    return {
+        "pressed_appearance": ButtonAppearance(1.2, alpha=150),
+        "hovered_appearance": ButtonAppearance(background_appearance=(
+            ButtonBackgroundAppearance(colour=(150, 150, 150), line_width=3),
+            ButtonBackgroundAppearance(colour=(150, 150, 150), size_percentage=0.9, corner_radius_percentage=0.5))),
+        "selected_appearance": ButtonAppearance(background_appearance=ButtonBackgroundAppearance(
+            size_percentage=1.1, colour=(150, 150, 150), corner_radius_percentage=0.1)),
+        "passive_appearance": ButtonAppearance(alpha=150, grayscale=True)
+    }
+
+
+def generate_buttons(number: int, textures: int = 8, surface_cache: SurfaceCache = None) -> tuple[BaseButton, ...]:
+    """
+    generate buttons sharing a few textures, like icon toolbars do
+    :param number: number of buttons
+    :param textures: number of different textures
+    :param surface_cache: cache used by the buttons
+    :return: tuple of buttons
+    """
+    appearances = generate_appearances()
+    texture_surfaces = [generate_texture(seed) for seed in range(textures)]
+    return tuple(BaseButton(texture_surfaces[index % textures], commands=lambda: None, surface_cache=surface_cache,
+                            **appearances)
+                 for index in range(number))
+
+
+def generate_events(box_size: tuple[int, int], frames: int, events_per_frame: int, seed: int = 0) -> list[list]:
+    """
+    generate a deterministic stream of mouse events moving over a box and clicking from time to time
+    :param box_size: size of the box the events are generated for
+    :param frames: number of frames
+    :param events_per_frame: number of MOUSEMOTION events per frame
+    :param seed: seed for the generated positions
+    :return: list of event lists, one per frame
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.integers((-20, -20), (box_size[0] + 20, box_size[1] + 20), (frames, events_per_frame, 2))
+    stream = []
+    for frame, frame_positions in enumerate(positions):
+        events = [pygame.event.Event(pygame.MOUSEMOTION, pos=tuple(pos), rel=(0, 0), buttons=(0, 0, 0))
+                  for pos in frame_positions.tolist()]
+        if frame % 10 == 0:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=events[-1].pos, button=1))
+        elif frame % 10 == 1:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=events[-1].pos, button=1))
+        stream.append(events)
+    return stream
+
+
+def bench_appearance(runs: int, button_size: int) -> list[dict]:
+    texture = generate_texture(0)
+    return [summarise("ButtonAppearance.get_appearance_applied_button",
+                      measure(lambda run: appearance.get_appearance_applied_button(texture, button_size), runs),
+                      appearance=keyword, button_size=button_size)
+            for keyword, appearance in generate_appearances().items()]
+
+
+def bench_batch_appearance(runs: int, button_size: int, textures: int = 256) -> list[dict]:
+    texture_list = [generate_texture(seed) for seed in range(textures)]
+    results = []
+    for keyword, appearance in generate_appearances().items():
+        single = measure(lambda run: [appearance.get_appearance_applied_button(texture, button_size)
+                                      for texture in texture_list], runs)
+        batch = measure(lambda run: appearance.get_appearance_applied_buttons(texture_list, button_size), runs)
+        results += [summarise("ButtonAppearance.get_appearance_applied_button", single, appearance=keyword,
+                              button_size=button_size, textures=textures),
+                    summarise("ButtonAppearance.get_appearance_applied_buttons", batch, appearance=keyword,
+                              button_size=button_size, textures=textures)]
+    return results
+
+
+def bench_get_surface(runs: int, button_size: int) -> list[dict]:
+    cache = SurfaceCache(None)
+    button = generate_buttons(1, surface_cache=cache)[0]
+
+    def clear_caches(run: int):
+        cache.clear()
+        buttons.background_surface_cache.clear()
+
+    cold = measure(lambda run: button.get_surface(button_size, buttons.HOVERED_STATE), runs, clear_caches)
+    warm = measure(lambda run: button.get_surface(button_size, buttons.HOVERED_STATE), runs)
+    return [summarise("BaseButton.get_surface", cold, cache="cold", button_size=button_size),
+            summarise("BaseButton.get_surface", warm, cache="warm", button_size=button_size)]
+
+
+def bench_terminate_surface(grid_size: int, frames: int, button_size: int) -> list[dict]:
+    arrangement = ButtonArrangement((grid_size, grid_size), generate_buttons(grid_size ** 2), None, button_size)
+    arrangement.terminate_surface()
+    number = len(arrangement.buttons)
+
+    idle = measure(lambda run: arrangement.terminate_surface(), frames)
+    hover = measure(lambda run: arrangement.terminate_surface(), frames,
+                    lambda run: arrangement.set_hovered(run * 7 % number))
+    return [summarise("ButtonArrangement.terminate_surface", idle, grid_size=grid_size, frame="idle"),
+            summarise("ButtonArrangement.terminate_surface", hover, grid_size=grid_size, frame="hover change")]
+
+
+def bench_run_logic(grid_size: int, frames: int, button_size: int, events_per_frame: int) -> list[dict]:
+    results = []
+    for coalesce in (False, True):
+        box = ButtonBox((grid_size, grid_size), button_size, selected_mode=True, coalesce_motion_events=coalesce)
+        box.add_button_arrangement("main", (grid_size, grid_size), generate_buttons(grid_size ** 2))
+        box.prewarm()
+        stream = generate_events(box.get_size(), frames, events_per_frame)
+        results.append(summarise("ButtonBox.run_logic",
+                                 measure(lambda run: box.run_logic(stream[run], (0, 0)), frames),
+                                 grid_size=grid_size, events_per_frame=events_per_frame, coalesce=coalesce))
+    return results
+
+
+def bench_hit_test(grid_size: int, runs: int, button_size: int,
+                   position_counts: tuple[int, ...] = (1, 16, 256, 4096)) -> list[dict]:
+    box = ButtonBox((grid_size, grid_size), button_size)
+    box.add_button_arrangement("main", (grid_size, grid_size), generate_buttons(grid_size ** 2))
+    generator = np.random.default_rng(0)
+    results = []
+    for count in position_counts:
+        positions = generator.integers(0, box.get_size(), (count, 2))
+        position_tuples = [tuple(position) for position in positions.tolist()]
+        single = measure(lambda run: [box.get_index_at_position(position) for position in position_tuples], runs)
+        batch = measure(lambda run: box.get_indices_at_positions(positions), runs)
+        results += [summarise("ButtonBox.get_index_at_position", single, grid_size=grid_size, positions=count),
+                    summarise("ButtonBox.get_indices_at_positions", batch, grid_size=grid_size, positions=count)]
+    return results
+
+
+def bench_blit(grid_size: int, frames: int, button_size: int, events_per_frame: int) -> list[dict]:
+    window = pygame.display.get_surface()
+    results = []
+    for partial_blit in (False, True):
+        box = EmbeddedButtonBox(6, (grid_size, grid_size), button_size, additional_padding_size=4,
+                                outline_corner_radius=20, heading_text="Benchmark", partial_blit=partial_blit)
+        box.add_button_arrangement("main", (grid_size, grid_size), generate_buttons(grid_size ** 2))
+        box.prewarm()
+        stream = generate_events(box.get_size(), frames, events_per_frame)
+        box.run_logic([], (0, 0))
+        box.blit_if_necessary(window, (0, 0))
+        results.append(summarise("EmbeddedButtonBox.blit_if_necessary",
+                                 measure(lambda run: box.blit_if_necessary(window, (0, 0)), frames,
+                                         lambda run: box.run_logic(stream[run], (0, 0))),
+                                 grid_size=grid_size, partial_blit=partial_blit, frame="input"))
+
+    results.append(summarise("EmbeddedButtonBox.blit_if_necessary",
+                             measure(lambda run: box.blit_if_necessary(window, (0, 0), True), frames),
+                             grid_size=grid_size, frame="forced reload"))
+    return results
+
+
+def run_benchmarks(grid_sizes: tuple[int, ...] = (4, 16, 32),
+                   frames: int = 300,
+                   button_size: int = 48,
+                   events_per_frame: int = 12) -> dict:
+    """
+    run all benchmarks
+    :param grid_sizes: numbers of buttons along both axes to run the grid benchmarks with
+    :param frames: number of measured runs per benchmark
+    :param button_size: button size used by all benchmarks
+    :param events_per_frame: number of MOUSEMOTION events per frame for the input benchmarks
+    :return: dict with the environment and all results
+    """
+    pygame.init()
+    largest_box = ButtonBox((max(grid_sizes),) * 2, button_size).get_size()
+    pygame.display.set_mode((largest_box[0] + 100, largest_box[1] + 100))
+
+    results = bench_appearance(frames, button_size) + bench_get_surface(frames, button_size)
+    results += bench_batch_appearance(max(1, frames // 50), button_size)
+    results += bench_hit_test(max(grid_sizes), frames, button_size)
+    for grid_size in grid_sizes:
+        results += bench_terminate_surface(grid_size, frames, button_size)
+        results += bench_run_logic(grid_size, frames, button_size, events_per_frame)
+        results += bench_blit(grid_size, frames, button_size, events_per_frame)
+
+    return {"environment": {"python": platform.python_version(),
+                            "pygame": pygame.version.ver,
+                            "sdl": ".".join(map(str, pygame.get_sdl_version())),
+                            "numpy": np.__version__,
+                            "platform": platform.platform(),
+                            "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "results": results}
+
+
+def _get_result_key(result: dict) -> str:
+    return result["name"] + json.dumps(result["parameters"], sort_keys=True)
+
+
+def compare_results(results: dict, previous_results: dict) -> list[tuple[str, float, float]]:
+    """
+    compare the median frame times of two benchmark runs
+    :param results: results of the current run
+    :param previous_results: results of an earlier run
+    :return: list of benchmark keys with previous and current median in milliseconds for all common benchmarks
+    """
+    previous = {_get_result_key(result): result for result in previous_results["results"]}
+    return [(_get_result_key(result), previous[_get_result_key(result)]["p50_ms"], result["p50_ms"])
+            for result in results["results"] if _get_result_key(result) in previous]
+
+
+def print_results(results: dict):
+    print(f"{'benchmark':<96}{'runs/s':>12}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for result in results["results"]:
+        label = result["name"] + " " + ", ".join(f"{key}={value}" for key, value in result["parameters"].items())
+        print(f"{label:<96}{result['throughput']:>12.1f}{result['p50_ms']:>10.3f}{result['p90_ms']:>10.3f}"
+              f"{result['p99_ms']:>10.3f}{result['max_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="headless benchmarks for the buttons module")
+    parser.add_argument("--grid-sizes", type=int, nargs="+", default=[4, 16, 32])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--button-size", type=int, default=48)
+    parser.add_argument("--events-per-frame", type=int, default=12)
+    parser.add_argument("--output", help="path of the json file to save the results to")
+    parser.add_argument("--compare", help="path of a json file with earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="median slowdown factor above which a benchmark is reported as regression")
+    arguments = parser.parse_args()
+
+    benchmark_results = run_benchmarks(tuple(arguments.grid_sizes), arguments.frames, arguments.button_size,
+                                       arguments.events_per_frame)
+    print_results(benchmark_results)
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as file:
+            json.dump(benchmark_results, file, indent=2)
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as file:
+            comparison = compare_results(benchmark_results, json.load(file))
+
+        regressions = 0
+        print(f"\n{'benchmark':<100}{'before ms':>12}{'after ms':>12}{'factor':>8}")
+        for key, before, after in comparison:
+            factor = after / before if before > 0 else float("inf")
+            regressions += factor > arguments.threshold
+            print(f"{key:<100}{before:>12.3f}{after:>12.3f}{factor:>8.2f}"
+                  f"{'  regression' if factor > arguments.threshold else ''}")
+        raise SystemExit(1 if regressions else 0)
@@ -1,28 +1,302 @@
 from __future__ import annotations
 
+import array
+import asyncio
+import collections
+import concurrent.futures
+import enum
+import inspect
 import math
 import time
 import typing
+import weakref
 
 import numpy as np
 import pygame
 
 
+class SurfaceAtlas:
+    def __init__(self, page_size: tuple[int, int] = (1024, 1024)):
+        """
+        packs many small surfaces into a few big atlas pages, so that they share memory and can be blitted together
+        :param page_size: size of every atlas page, surfaces bigger than a page are not packed
+        """
+        self.page_size = page_size
+        self.pages: list[pygame.Surface] = []
+
+        # every shelf is a list of its vertical position, height and used width, shelves and counts of used surfaces
+        # are stored by the id of their page:
+        self._shelves: dict[int, list[list[int]]] = {}
+        self._live_counts: dict[int, int] = {}
+
+    @property
+    def page_bytes(self) -> int:
+        """
+        number of bytes occupied by the pixels of all pages
+        """
+        return sum(page.get_pitch() * page.get_height() for page in self.pages)
+
+    def _add_page(self) -> pygame.Surface:
+        page = pygame.Surface(self.page_size).convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self._shelves[id(page)] = []
+        self._live_counts[id(page)] = 0
+        return page
+
+    def _find_position(self, page: pygame.Surface, size: tuple[int, int]) -> tuple[int, int] | None:
+        shelves = self._shelves[id(page)]
+        for shelf in shelves:
+            if shelf[1] >= size[1] and shelf[2] + size[0] <= self.page_size[0]:
+                position = (shelf[2], shelf[0])
+                shelf[2] += size[0]
+                return position
+
+        shelf_position = shelves[-1][0] + shelves[-1][1] if shelves else 0
+        if shelf_position + size[1] > self.page_size[1]:
+            return None
+        shelves.append([shelf_position, size[1], size[0]])
+        return 0, shelf_position
+
+    def add(self, surface: pygame.Surface) -> pygame.Surface:
+        """
+        copy a surface into the atlas
+        :param surface: surface with per pixel alpha to be packed
+        :return: subsurface of an atlas page with the same content as the given surface, or the given surface itself if
+                 it can not be packed
+        """
+        size = surface.get_size()
+        if (size[0] > self.page_size[0] or size[1] > self.page_size[1] or
+                not surface.get_flags() & pygame.SRCALPHA or surface.get_alpha() not in (None, 255)):
+            return surface
+
+        for page in self.pages:
+            position = self._find_position(page, size)
+            if position is not None:
+                break
+        else:
+            page = self._add_page()
+            position = self._find_position(page, size)
+
+        # adding onto the transparent page copies the pixels including their alpha values unchanged:
+        page.blit(surface, position, special_flags=pygame.BLEND_RGBA_ADD)
+        self._live_counts[id(page)] += 1
+        return page.subsurface(position + size)
+
+    def owns(self, surface: pygame.Surface) -> bool:
+        """
+        check if a surface has been returned by add and its page is still part of the atlas
+        :param surface: surface to be checked
+        :return: True if the surface is stored in a page of the atlas
+        """
+        parent = surface.get_parent()
+        # a dropped page is kept alive by its subsurfaces, so its id can not be reused by a page of the atlas:
+        return parent is not None and id(parent) in self._live_counts and any(page is parent for page in self.pages)
+
+    def release(self, surface: pygame.Surface) -> bool:
+        """
+        mark a surface returned by add as unused, pages without used surfaces are dropped
+        :param surface: surface returned by add
+        :return: True if the surface was stored in the atlas
+        """
+        if not self.owns(surface):
+            return False
+
+        page = surface.get_parent()
+        self._live_counts[id(page)] -= 1
+        if self._live_counts[id(page)] == 0:
+            self.pages.remove(page)
+            del self._shelves[id(page)]
+            del self._live_counts[id(page)]
+        return True
+
+
+class SurfaceCache:
+    def __init__(self, byte_budget: int | None = 64 * 1024 ** 2, atlas: SurfaceAtlas = None):
+        """
+        least recently used cache for rendered surfaces, limited by the memory of the cached surfaces
+        :param byte_budget: maximum number of bytes the cached surfaces may occupy, None means no limit
+        :param atlas: if an atlas is specified the added surfaces are stored in it instead of separate surfaces, its
+                      pages are counted against the byte budget (an atlas must not be shared between caches)
+        """
+        self.byte_budget = byte_budget
+        self.atlas = atlas
+        self.hits = 0
+        self.misses = 0
+        self._surfaces: collections.OrderedDict[typing.Hashable, pygame.Surface] = collections.OrderedDict()
+        # bytes of the cached surfaces that are not stored in the atlas:
+        self._separate_bytes = 0
+        self._eviction_deferrals = 0
+
+    @property
+    def cached_bytes(self) -> int:
+        """
+        number of bytes occupied by the cached surfaces, including the whole pages of the atlas
+        """
+        return self._separate_bytes + (self.atlas.page_bytes if self.atlas is not None else 0)
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self._surfaces
+
+    @staticmethod
+    def get_surface_bytes(surface: pygame.Surface) -> int:
+        """
+        get the number of bytes occupied by the pixels of a surface
+        :param surface: surface to be measured
+        :return: size of the pixel buffer in bytes
+        """
+        if surface.get_parent() is not None:
+            # subsurfaces share the rows of their parent, only their own area is counted:
+            return surface.get_bytesize() * surface.get_width() * surface.get_height()
+        return surface.get_pitch() * surface.get_height()
+
+    def get(self, key: typing.Hashable, count: bool = True) -> pygame.Surface | None:
+        """
+        get a cached surface and mark it as recently used
+        :param key: key the surface was added with
+        :param count: if False the lookup is not counted in hits and misses
+        :return: the cached surface or None if there is no surface cached for the given key
+        """
+        surface = self._surfaces.get(key)
+        if surface is None:
+            self.misses += count
+        else:
+            self.hits += count
+            self._surfaces.move_to_end(key)
+        return surface
+
+    def add(self, key: typing.Hashable, surface: pygame.Surface) -> pygame.Surface:
+        """
+        add a surface to the cache and evict the least recently used surfaces if the byte budget is exceeded
+        :param key: key to store the surface with
+        :param surface: surface to be cached
+        :return: the cached surface, which is a copy inside the atlas if the cache has one
+        """
+        self.remove(key)
+        if self.atlas is not None:
+            surface = self.atlas.add(surface)
+        self._surfaces[key] = surface
+        if self.atlas is None or not self.atlas.owns(surface):
+            self._separate_bytes += self.get_surface_bytes(surface)
+        self._evict()
+        return surface
+
+    def remove(self, key: typing.Hashable):
+        """
+        remove the surface with the given key from the cache if it is cached
+        :param key: key of the surface
+        """
+        surface = self._surfaces.pop(key, None)
+        if surface is not None:
+            self._release(surface)
+
+    def set_byte_budget(self, byte_budget: int | None):
+        """
+        change the byte budget, evicting surfaces if the new budget is exceeded
+        :param byte_budget: maximum number of bytes the cached surfaces may occupy, None means no limit
+        """
+        self.byte_budget = byte_budget
+        self._evict()
+
+    def clear(self):
+        """
+        remove all cached surfaces
+        """
+        while self._surfaces:
+            self._release(self._surfaces.popitem()[1])
+
+    def defer_eviction(self):
+        """
+        postpone evicting surfaces until resume_eviction is called as often as this method, so that surfaces returned
+        in between stay valid (an evicted atlas surface can be overwritten by the next added one)
+        """
+        self._eviction_deferrals += 1
+
+    def resume_eviction(self):
+        """
+        end a deferral started by defer_eviction and evict the surfaces exceeding the byte budget
+        """
+        self._eviction_deferrals -= 1
+        self._evict()
+
+    def _evict(self):
+        if self.byte_budget is None or self._eviction_deferrals:
+            return None
+
+        while self.cached_bytes > self.byte_budget and self._surfaces:
+            self._release(self._surfaces.popitem(last=False)[1])
+
+    def _release(self, surface: pygame.Surface):
+        if self.atlas is None or not self.atlas.release(surface):
+            self._separate_bytes -= self.get_surface_bytes(surface)
+
+
+# cache for the background layers of all appearances:
+background_surface_cache = SurfaceCache(16 * 1024 ** 2)
+
+# number of textures stacked onto one surface by ButtonAppearance.get_appearance_applied_buttons:
+TEXTURE_STACK_LENGTH = 64
+# stack surfaces kept for later calls of ButtonAppearance.get_appearance_applied_buttons, as allocating them is slow:
+_texture_stacks: list[pygame.Surface] = []
+
+
 class ButtonBackgroundAppearance:
+    __slots__ = ("size_percentage", "corner_radius_percentage", "colour", "line_width", "smooth_scaling", "_parameters",
+                 "_hash")
+
     def __init__(self,
                  size_percentage: float = 1,
                  corner_radius_percentage: float = None,
                  colour: tuple | np.ndarray = (120, 120, 120),
                  line_width: int = 0,
                  smooth_scaling: bool = True):
+        """
+        immutable description of a background layer drawn behind a button, equally configured instances are equal and
+        share their rendered surfaces
+        :param size_percentage: size of the background relative to the button size
+        :param corner_radius_percentage: corner radius relative to the button size (None means no round corners)
+        :param colour: colour of the background
+        :param line_width: line width of the drawn rect (0 means filled)
+        :param smooth_scaling: unused, kept for compatibility
+        """
         self.size_percentage = size_percentage
         self.corner_radius_percentage = corner_radius_percentage
-        self.colour = colour
+        self.colour = tuple(colour)
         self.line_width = line_width
 
         self.smooth_scaling = smooth_scaling
 
-    def get_surface(self, size: int) -> pygame.Surface:
+        self._parameters = (self.size_percentage,
+                            self.corner_radius_percentage,
+                            self.colour,
+                            self.line_width,
+                            self.smooth_scaling)
+        self._hash = hash(self._parameters)
+
+    def __setattr__(self, name: str, value):
+        if hasattr(self, "_hash"):
+            raise AttributeError(f"{type(self).__name__} is immutable")
+        super().__setattr__(name, value)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._hash == other._hash and self._parameters == other._parameters
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self._parameters}"
+
+    def __reduce__(self) -> tuple:
+        # the parameters are in the order of the arguments, restoring the slots one by one would fail on immutability:
+        return type(self), self._parameters
+
+    def _render_surface(self, size: int) -> pygame.Surface:
         surface_size = math.ceil(size * self.size_percentage)
         background_surface = pygame.Surface((surface_size,) * 2).convert_alpha()
         background_surface.fill((255, 255, 255, 0))
@@ -34,52 +308,127 @@ class ButtonBackgroundAppearance:
                                    self.corner_radius_percentage is not None else -1))
         return background_surface
 
+    def get_surface(self, size: int) -> pygame.Surface:
+        """
+        get the rendered background for a given button size, the surface is shared between all equal appearances and
+        must not be modified
+        :param size: button size
+        :return: background surface
+        """
+        key = (self, size)
+        background_surface = background_surface_cache.get(key)
+        if background_surface is None:
+            background_surface = self._render_surface(size)
+            background_surface_cache.add(key, background_surface)
+        return background_surface
+
 
 class ButtonAppearance:
+    __slots__ = ("size_percentage", "alpha", "grayscale", "background_appearance", "smooth_scaling", "tint",
+                 "_parameters", "_hash")
+
     def __init__(self,
                  size_percentage: float = 1,
                  alpha: int = None,
                  grayscale: bool = False,
                  background_appearance: ButtonBackgroundAppearance | tuple[ButtonBackgroundAppearance, ...] = None,
-                 smooth_scaling: bool = True):
+                 smooth_scaling: bool = True,
+                 tint: tuple[int, int, int] | np.ndarray = None):
+        """
+        immutable description of how a button texture is displayed in a state, equally configured instances are equal
+        and share their rendered surfaces
+        :param size_percentage: size of the texture relative to the button size
+        :param alpha: alpha value applied to the texture (None means unchanged)
+        :param grayscale: if True the button including its background is converted to grayscale
+        :param background_appearance: ButtonBackgroundAppearance or tuple of ButtonBackgroundAppearances drawn behind
+                                      the texture in the given order
+        :param smooth_scaling: use smoothscale instead of scale to resize the texture
+        :param tint: rgb colour the texture colours are multiplied with (None means unchanged)
+        """
         self.size_percentage = size_percentage
         self.alpha = alpha
         self.grayscale = grayscale
-        self.background_appearance = background_appearance
+        self.background_appearance = tuple(background_appearance) \
+            if hasattr(background_appearance, "__iter__") else background_appearance
 
         self.smooth_scaling = smooth_scaling
+        self.tint = tuple(int(channel) for channel in tint[:3]) if tint is not None else None
 
-    def get_appearance_applied_button(self, texture: pygame.Surface, size: int) -> pygame.Surface:
-        # setting up surface:
+        self._parameters = (self.size_percentage,
+                            self.alpha,
+                            self.grayscale,
+                            self.background_appearance,
+                            self.smooth_scaling,
+                            self.tint)
+        self._hash = hash(self._parameters)
+
+    def __setattr__(self, name: str, value):
+        if hasattr(self, "_hash"):
+            raise AttributeError(f"{type(self).__name__} is immutable")
+        super().__setattr__(name, value)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._hash == other._hash and self._parameters == other._parameters
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self._parameters}"
+
+    def __reduce__(self) -> tuple:
+        # the parameters are in the order of the arguments, restoring the slots one by one would fail on immutability:
+        return type(self), self._parameters
+
+    def _get_backgrounds(self) -> tuple[ButtonBackgroundAppearance, ...]:
         if type(self.background_appearance) is ButtonBackgroundAppearance:
-            surface_size = math.ceil(size * max(self.size_percentage, self.background_appearance.size_percentage))
-        elif hasattr(self.background_appearance, "__iter__"):
-            surface_size = math.ceil(size * max(self.size_percentage,
-                                                *tuple(appearance.size_percentage for appearance
-                                                       in self.background_appearance)))
-        else:
-            surface_size = math.ceil(size * self.size_percentage)
+            return self.background_appearance,
+        if hasattr(self.background_appearance, "__iter__"):
+            return self.background_appearance
+        return ()
+
+    def _get_background_applied_surface(self, size: int) -> pygame.Surface:
+        """
+        create the appearance surface for a button size with the backgrounds drawn on it
+        :param size: size of the button
+        :return: new surface
+        """
+        backgrounds = self._get_backgrounds()
+        surface_size = math.ceil(size * max((self.size_percentage,
+                                             *tuple(background.size_percentage for background in backgrounds))))
         appearance_surface = pygame.Surface((surface_size,) * 2).convert_alpha()
         appearance_surface.fill((255, 255, 255, 0))
 
-        # adding background surface:
-        if type(self.background_appearance) is ButtonBackgroundAppearance:
-            background_surface = self.background_appearance.get_surface(size)
+        for background in backgrounds:
+            background_surface = background.get_surface(size)
             position_on_appearance_surface = ((surface_size - background_surface.get_width()) // 2,) * 2
             appearance_surface.blit(background_surface, position_on_appearance_surface)
-        elif hasattr(self.background_appearance, "__iter__"):
-            for background in self.background_appearance:
-                background_surface = background.get_surface(size)
-                position_on_appearance_surface = ((surface_size - background_surface.get_width()) // 2,) * 2
-                appearance_surface.blit(background_surface, position_on_appearance_surface)
+        return appearance_surface
 
-        # adding button:
+    def _get_scaled_texture(self, texture: pygame.Surface, size: int) -> pygame.Surface:
         button_size = math.ceil(self.size_percentage * size)
-
         if self.smooth_scaling:
-            button_surface = pygame.transform.smoothscale(texture, (button_size,) * 2)
-        else:
-            button_surface = pygame.transform.scale(texture, (button_size,) * 2)
+            return pygame.transform.smoothscale(texture, (button_size,) * 2)
+        return pygame.transform.scale(texture, (button_size,) * 2)
+
+    def _apply_texture(self, appearance_surface: pygame.Surface, texture: pygame.Surface, size: int) -> pygame.Surface:
+        """
+        draw a texture onto a surface created by _get_background_applied_surface
+        :param appearance_surface: surface with the backgrounds drawn on it, it is modified
+        :param texture: texture of the button
+        :param size: size of the button
+        :return: finished surface (a new one if grayscale is set)
+        """
+        surface_size = appearance_surface.get_width()
+
+        # adding button:
+        button_surface = self._get_scaled_texture(texture, size)
+        button_size = button_surface.get_width()
+
+        if self.tint is not None:
+            button_surface.fill(self.tint, special_flags=pygame.BLEND_RGB_MULT)
 
         if self.alpha is not None:
             button_surface.set_alpha(self.alpha)
@@ -91,15 +440,400 @@ class ButtonAppearance:
 
         return appearance_surface
 
+    def get_appearance_applied_button(self, texture: pygame.Surface, size: int) -> pygame.Surface:
+        # setting up surface and adding background surfaces:
+        return self._apply_texture(self._get_background_applied_surface(size), texture, size)
 
-NORMAL_STATE = "normal_state"
-PRESSED_STATE = "pressed_state"
-HOVERED_STATE = "hovered_state"
-SELECTED_STATE = "selected_state"
-PASSIVE_STATE = "passive_state"
+    def get_appearance_applied_buttons(self,
+                                       textures: list[pygame.Surface] | tuple[pygame.Surface, ...],
+                                       size: int) -> list[pygame.Surface]:
+        """
+        render the appearance of many textures at once, with backgrounds they are drawn only once and copied for every
+        texture, without backgrounds the scaled textures are stacked onto one surface, which is tinted, made transparent
+        and grayscaled by single operations (colours can differ from get_appearance_applied_button by rounding)
+        :param textures: textures to be rendered
+        :param size: size of the buttons
+        :return: list of rendered surfaces in the order of the textures
+        """
+        if self._get_backgrounds():
+            background_surface = self._get_background_applied_surface(size)
+            return [self._apply_texture(background_surface.copy(), texture, size) for texture in textures]
+
+        if self.alpha is not None and not all(texture.get_flags() & pygame.SRCALPHA for texture in textures):
+            # the alpha is blended differently for textures without per pixel alpha, they are rendered one by one:
+            batched_surfaces = iter(self.get_appearance_applied_buttons(
+                [texture for texture in textures if texture.get_flags() & pygame.SRCALPHA], size))
+            return [next(batched_surfaces) if texture.get_flags() & pygame.SRCALPHA
+                    else self.get_appearance_applied_button(texture, size) for texture in textures]
+
+        button_size = math.ceil(self.size_percentage * size)
+        scale = pygame.transform.smoothscale if self.smooth_scaling else pygame.transform.scale
+        surfaces = []
+        # taking the stack out of the pool, so that no other thread uses it at the same time:
+        stack = _texture_stacks.pop() if _texture_stacks else None
+        if stack is None or stack.get_width() != button_size:
+            stack = pygame.Surface((button_size, TEXTURE_STACK_LENGTH * button_size)).convert_alpha()
+
+        try:
+            for start in range(0, len(textures), TEXTURE_STACK_LENGTH):
+                stacked_textures = textures[start:start + TEXTURE_STACK_LENGTH]
+                used_stack = stack.subsurface((0, 0, button_size, len(stacked_textures) * button_size))
+                used_stack.fill((255, 255, 255, 0))
+                texture_surfaces = [used_stack.subsurface((0, index * button_size, button_size, button_size))
+                                    for index in range(len(stacked_textures))]
+
+                for texture, texture_surface in zip(stacked_textures, texture_surfaces):
+                    if texture.get_bitsize() != 32 or texture.get_masks() != texture_surface.get_masks():
+                        # scaling into a surface needs equal pixel formats:
+                        texture = texture.convert(texture_surface)
+                    scale(texture, (button_size,) * 2, texture_surface)
+
+                if self.tint is not None:
+                    used_stack.fill(self.tint, special_flags=pygame.BLEND_RGB_MULT)
+
+                if self.alpha is not None:
+                    used_stack.fill((255, 255, 255, self.alpha), special_flags=pygame.BLEND_RGBA_MULT)
+
+                if self.grayscale:
+                    pygame.transform.grayscale(used_stack, used_stack)
+
+                surfaces += [texture_surface.copy() for texture_surface in texture_surfaces]
+        finally:
+            _texture_stacks.append(stack)
+
+        return surfaces
+
+
+# cache shared by all buttons, so that buttons with equal textures and appearances only render their surfaces once:
+appearance_surface_cache = SurfaceCache()
+
+
+def cache_appearance_applied_buttons(textures: list[pygame.Surface] | tuple[pygame.Surface, ...],
+                                     appearance: ButtonAppearance,
+                                     size: int,
+                                     surface_cache: SurfaceCache = None) -> int:
+    """
+    batch render the appearance of textures that are not cached yet and add them to a surface cache, so that buttons
+    using the textures find their surfaces there (see ButtonAppearance.get_appearance_applied_buttons)
+    :param textures: textures to be rendered
+    :param appearance: appearance to be applied
+    :param size: size of the buttons
+    :param surface_cache: cache to be filled, appearance_surface_cache is used by default
+    :return: number of rendered surfaces
+    """
+    surface_cache = surface_cache if surface_cache is not None else appearance_surface_cache
+    missing_textures = list({texture: None for texture in textures
+                             if (texture, appearance, size) not in surface_cache})
+
+    for texture, surface in zip(missing_textures, appearance.get_appearance_applied_buttons(missing_textures, size)):
+        surface_cache.add((texture, appearance, size), surface)
+    return len(missing_textures)
+
+
+class SurfacePool:
+    def __init__(self, max_surfaces_per_size: int = 2):
+        """
+        storage for surfaces that are no longer used, so that they can be reused instead of allocating new ones
+        :param max_surfaces_per_size: maximum number of stored surfaces of the same size, further ones are dropped
+        """
+        self.max_surfaces_per_size = max_surfaces_per_size
+        self._surfaces: dict[tuple[int, int], list[pygame.Surface]] = {}
+
+    def acquire(self, size: tuple[int, int]) -> pygame.Surface | None:
+        """
+        take a stored surface of the given size out of the pool
+        :param size: size of the needed surface
+        :return: surface with undefined content or None if there is no surface of the given size
+        """
+        surfaces = self._surfaces.get(tuple(size))
+        return surfaces.pop() if surfaces else None
+
+    def release(self, surface: pygame.Surface):
+        """
+        store a surface that is no longer used
+        :param surface: surface to be stored
+        """
+        surfaces = self._surfaces.setdefault(surface.get_size(), [])
+        if len(surfaces) < self.max_surfaces_per_size:
+            surfaces.append(surface)
+
+    def clear(self):
+        """
+        drop all stored surfaces
+        """
+        self._surfaces.clear()
+
+
+# cache for rendered EmbeddedButtonBox headings:
+heading_surface_cache = SurfaceCache(4 * 1024 ** 2)
+
+_sys_fonts: dict[tuple[str, int, bool, bool], pygame.Font] = {}
+
+
+def get_sys_font(name: str, size: int, bold: bool = False, italic: bool = False) -> pygame.Font:
+    """
+    get a SysFont, looking up the system fonts only the first time a combination of arguments is requested
+    :param name: name of the sys font
+    :param size: font size
+    :param bold: specifying if the font should be bold
+    :param italic: specifying if the font should be italic
+    :return: shared pygame font
+    """
+    key = (name, size, bold, italic)
+    font = _sys_fonts.get(key)
+    if font is None:
+        font = _sys_fonts[key] = pygame.font.SysFont(name, size, bold, italic)
+    return font
+
+
+class FrameStatistics(typing.NamedTuple):
+    run_logic_time: float
+    terminate_time: float
+    blit_time: float
+    redrawn_cells: int
+    full_reloads: int
+    dirty_rects: int
+    cache_hits: int
+    cache_misses: int
+    cached_bytes: int
+
+
+class BoxStatistics:
+    def __init__(self,
+                 get_surface_caches: typing.Callable[[], typing.Iterable[SurfaceCache]],
+                 history_size: int = 600,
+                 callback: typing.Callable[[FrameStatistics], typing.Any] = None):
+        """
+        collects per frame measurements of a ButtonBox, a frame ends with every call of blit_if_necessary
+        :param get_surface_caches: returns the caches used by the buttons of the box, called by update_surface_caches
+                                   when arrangements are added, not for every frame
+        :param history_size: number of frames kept in the history ring buffer
+        :param callback: called with the FrameStatistics of every finished frame
+        """
+        self.get_surface_caches = get_surface_caches
+        self.surface_caches: tuple[SurfaceCache, ...] = ()
+        self.update_surface_caches()
+        self.history: collections.deque[FrameStatistics] = collections.deque(maxlen=history_size)
+        self.callback = callback
+
+        self.frames = 0
+        self.total_run_logic_time = 0.0
+        self.total_terminate_time = 0.0
+        self.total_blit_time = 0.0
+        self.total_redrawn_cells = 0
+        self.total_full_reloads = 0
+
+        self._run_logic_time = 0.0
+        self._terminate_time = 0.0
+        self._redrawn_cells = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def add_logic(self,
+                  run_logic_time: float,
+                  terminate_time: float,
+                  redrawn_cells: int,
+                  cache_hits: int,
+                  cache_misses: int):
+        """
+        add the measurements of a call of run_logic to the current frame
+        :param run_logic_time: duration of run_logic in seconds, including terminate_time
+        :param terminate_time: duration of terminate_surface in seconds
+        :param redrawn_cells: number of cells redrawn by terminate_surface
+        :param cache_hits: number of surface cache lookups that were hits
+        :param cache_misses: number of surface cache lookups that were misses
+        """
+        self._run_logic_time += run_logic_time
+        self._terminate_time += terminate_time
+        self._redrawn_cells += redrawn_cells
+        self._cache_hits += cache_hits
+        self._cache_misses += cache_misses
+
+    def add_terminate(self,
+                      terminate_time: float,
+                      redrawn_cells: int,
+                      cache_hits: int,
+                      cache_misses: int):
+        """
+        add the measurements of a call of terminate_surface made by blit_if_necessary (with direct rendering) to the
+        current frame, its time is part of the blit time instead of the run_logic time
+        :param terminate_time: duration of terminate_surface in seconds
+        :param redrawn_cells: number of cells redrawn by terminate_surface
+        :param cache_hits: number of surface cache lookups that were hits
+        :param cache_misses: number of surface cache lookups that were misses
+        """
+        self._terminate_time += terminate_time
+        self._redrawn_cells += redrawn_cells
+        self._cache_hits += cache_hits
+        self._cache_misses += cache_misses
+
+    def update_surface_caches(self):
+        """
+        resolve the caches of the box again, called by ButtonBox.add_button_arrangement and needed to be called if the
+        surface_cache of a button or the box is replaced
+        """
+        self.surface_caches = tuple(self.get_surface_caches())
+
+    def get_cache_lookups(self) -> tuple[int, int]:
+        """
+        get the summed hits and misses of the caches of the box, the differences between two calls are the lookups
+        in between
+        :return: hits and misses
+        """
+        return sum(cache.hits for cache in self.surface_caches), sum(cache.misses for cache in self.surface_caches)
+
+    def finish_frame(self, blit_time: float, full_reload: bool, dirty_rects: int) -> FrameStatistics:
+        """
+        finish the current frame, store its statistics in the history and hand them to the callback
+        :param blit_time: duration of blit_if_necessary in seconds
+        :param full_reload: True if the box was blitted completely
+        :param dirty_rects: number of rects returned by blit_if_necessary
+        :return: statistics of the finished frame
+        """
+        frame = FrameStatistics(run_logic_time=self._run_logic_time,
+                                terminate_time=self._terminate_time,
+                                blit_time=blit_time,
+                                redrawn_cells=self._redrawn_cells,
+                                full_reloads=int(full_reload),
+                                dirty_rects=dirty_rects,
+                                cache_hits=self._cache_hits,
+                                cache_misses=self._cache_misses,
+                                cached_bytes=sum(cache.cached_bytes for cache in self.surface_caches))
+
+        self.frames += 1
+        self.total_run_logic_time += frame.run_logic_time
+        self.total_terminate_time += frame.terminate_time
+        self.total_blit_time += blit_time
+        self.total_redrawn_cells += frame.redrawn_cells
+        self.total_full_reloads += frame.full_reloads
+
+        self._run_logic_time = 0.0
+        self._terminate_time = 0.0
+        self._redrawn_cells = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        self.history.append(frame)
+        if self.callback is not None:
+            self.callback(frame)
+        return frame
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        """
+        get the share of surface cache lookups of the frames in the history that were hits
+        :return: hit rate between 0 and 1 or None if there were no lookups
+        """
+        hits = sum(frame.cache_hits for frame in self.history)
+        lookups = hits + sum(frame.cache_misses for frame in self.history)
+        return hits / lookups if lookups else None
+
+
+class ButtonState(enum.IntEnum):
+    """
+    states a button can be displayed in, the values index the appearance tables of the buttons
+    """
+    NORMAL = 0
+    PRESSED = 1
+    HOVERED = 2
+    SELECTED = 3
+    PASSIVE = 4
+
+
+NORMAL_STATE = ButtonState.NORMAL
+PRESSED_STATE = ButtonState.PRESSED
+HOVERED_STATE = ButtonState.HOVERED
+SELECTED_STATE = ButtonState.SELECTED
+PASSIVE_STATE = ButtonState.PASSIVE
+ALL_STATES = (NORMAL_STATE, HOVERED_STATE, PRESSED_STATE, SELECTED_STATE, PASSIVE_STATE)
+# displayed state of cells that have not been drawn yet:
+NO_STATE = -1
+
+# touch events processed by ButtonBoxes with multi_touch:
+FINGER_EVENT_TYPES = (pygame.FINGERDOWN, pygame.FINGERMOTION, pygame.FINGERUP)
+
+
+def get_finger_position(event: pygame.Event) -> tuple[int, int]:
+    """
+    get the position of a touch event on the display, the coordinates of touch events are normalised to the window
+    :param event: FINGERDOWN, FINGERMOTION or FINGERUP event
+    :return: position in pixels
+    """
+    width, height = pygame.display.get_window_size()
+    return int(event.x * width), int(event.y * height)
+
+
+class CommandExecutor:
+    def __init__(self,
+                 executor: concurrent.futures.Executor = None,
+                 loop: asyncio.AbstractEventLoop = None,
+                 max_workers: int = 4):
+        """
+        runs button commands outside of the render loop, completion callbacks are called from the thread calling
+        process_completed (ButtonBox.run_logic does so for the executors it submitted commands to)
+        :param executor: executor to run the commands in, if None and no loop is specified a ThreadPoolExecutor is
+                         created
+        :param loop: running asyncio event loop (in another thread) to run the commands on, commands returning
+                     awaitables are awaited on this loop
+        :param max_workers: number of threads of the created ThreadPoolExecutor
+        """
+        self.loop = loop
+        self.executor = executor if executor is not None or loop is not None \
+            else concurrent.futures.ThreadPoolExecutor(max_workers, thread_name_prefix="button_commands")
+        self.running = 0
+
+        # appended by the worker threads and emptied by the main thread, deque operations are thread safe:
+        self._completed: collections.deque[tuple[concurrent.futures.Future, typing.Callable | None]] = \
+            collections.deque()
+
+    def submit(self,
+               button: BaseButton,
+               on_done: typing.Callable[[concurrent.futures.Future], typing.Any] = None) -> concurrent.futures.Future:
+        """
+        start running the commands of a button
+        :param button: button whose commands should be called
+        :param on_done: called with the future of the commands by process_completed after they have finished, if None
+                        an exception raised by the commands is raised by process_completed
+        :return: future of the commands
+        """
+        if self.loop is not None:
+            future = asyncio.run_coroutine_threadsafe(button.call_commands_async(), self.loop)
+        else:
+            future = self.executor.submit(button.call_commands)
+
+        self.running += 1
+        future.add_done_callback(lambda done_future: self._completed.append((done_future, on_done)))
+        return future
+
+    def process_completed(self) -> int:
+        """
+        call the callbacks of all commands that have finished since the last call
+        :return: number of finished commands
+        """
+        processed = 0
+        while self._completed:
+            future, on_done = self._completed.popleft()
+            self.running -= 1
+            processed += 1
+            if on_done is not None:
+                on_done(future)
+            elif not future.cancelled() and future.exception() is not None:
+                raise future.exception()
+        return processed
+
+    def shutdown(self, wait: bool = True):
+        """
+        shut down the created thread pool or the given executor
+        :param wait: wait for running commands to finish
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait)
 
 
 class BaseButton:
+    __slots__ = ("texture", "commands", "args", "command_executor", "passive_while_running", "on_commands_done",
+                 "_appearances", "surface_cache")
+
     def __init__(self,
                  texture: pygame.Surface,
                  commands: tuple[typing.Callable, ...] | typing.Callable,
@@ -108,56 +842,112 @@ class BaseButton:
                  pressed_appearance: ButtonAppearance = None,
                  hovered_appearance: ButtonAppearance = None,
                  selected_appearance: ButtonAppearance = None,
-                 passive_appearance: ButtonAppearance = None
+                 passive_appearance: ButtonAppearance = None,
+                 surface_cache: SurfaceCache = None,
+                 command_executor: CommandExecutor = None,
+                 passive_while_running: bool = None,
+                 on_commands_done: typing.Callable[[concurrent.futures.Future], typing.Any] = None
                  ):
         default_appearance = ButtonAppearance()
         self.texture = texture
         self.commands = commands
         self.args = args
 
-        self.normal_appearance = normal_appearance if normal_appearance is not None else default_appearance
-        self.pressed_appearance = pressed_appearance if pressed_appearance is not None else default_appearance
-        self.hovered_appearance = hovered_appearance if hovered_appearance is not None else default_appearance
-        self.selected_appearance = selected_appearance if selected_appearance is not None else default_appearance
-        self.passive_appearance = passive_appearance if passive_appearance is not None else default_appearance
+        # asynchronous execution, the ButtonBoxes settings are used for unspecified values:
+        self.command_executor = command_executor
+        self.passive_while_running = passive_while_running
+        self.on_commands_done = on_commands_done
+
+        # appearances indexed by the state values:
+        self._appearances = [default_appearance, ] * len(ButtonState)
+        self._appearances[NORMAL_STATE] = normal_appearance if normal_appearance is not None else default_appearance
+        self._appearances[PRESSED_STATE] = pressed_appearance if pressed_appearance is not None else default_appearance
+        self._appearances[HOVERED_STATE] = hovered_appearance if hovered_appearance is not None else default_appearance
+        self._appearances[SELECTED_STATE] = selected_appearance if selected_appearance is not None \
+            else default_appearance
+        self._appearances[PASSIVE_STATE] = passive_appearance if passive_appearance is not None else default_appearance
+
+        self.surface_cache = surface_cache if surface_cache is not None else appearance_surface_cache
+
+    @property
+    def normal_appearance(self) -> ButtonAppearance:
+        return self._appearances[NORMAL_STATE]
+
+    @normal_appearance.setter
+    def normal_appearance(self, appearance: ButtonAppearance):
+        self._appearances[NORMAL_STATE] = appearance
+
+    @property
+    def pressed_appearance(self) -> ButtonAppearance:
+        return self._appearances[PRESSED_STATE]
+
+    @pressed_appearance.setter
+    def pressed_appearance(self, appearance: ButtonAppearance):
+        self._appearances[PRESSED_STATE] = appearance
+
+    @property
+    def hovered_appearance(self) -> ButtonAppearance:
+        return self._appearances[HOVERED_STATE]
+
+    @hovered_appearance.setter
+    def hovered_appearance(self, appearance: ButtonAppearance):
+        self._appearances[HOVERED_STATE] = appearance
+
+    @property
+    def selected_appearance(self) -> ButtonAppearance:
+        return self._appearances[SELECTED_STATE]
 
-        self.appearance_surface_cages = {
-            NORMAL_STATE: {},
-            PRESSED_STATE: {},
-            HOVERED_STATE: {},
-            SELECTED_STATE: {},
-            PASSIVE_STATE: {}
-        }
+    @selected_appearance.setter
+    def selected_appearance(self, appearance: ButtonAppearance):
+        self._appearances[SELECTED_STATE] = appearance
 
-    def get_appearance_by_state(self, state) -> ButtonAppearance:
+    @property
+    def passive_appearance(self) -> ButtonAppearance:
+        return self._appearances[PASSIVE_STATE]
+
+    @passive_appearance.setter
+    def passive_appearance(self, appearance: ButtonAppearance):
+        self._appearances[PASSIVE_STATE] = appearance
+
+    def get_appearance_by_state(self, state: int) -> ButtonAppearance:
         """
         method to get the appearance that matches the provided state
         :param state: state constant to be matched
         :return: the matching ButtonAppearance object
         """
-        if state == NORMAL_STATE:
-            return self.normal_appearance
-        if state == PRESSED_STATE:
-            return self.pressed_appearance
-        if state == HOVERED_STATE:
-            return self.hovered_appearance
-        if state == SELECTED_STATE:
-            return self.selected_appearance
-        if state == PASSIVE_STATE:
-            return self.passive_appearance
-        raise ValueError("unknown state")
-
-    def get_surface(self, button_size: int, state: str) -> pygame.Surface:
-        if self.appearance_surface_cages[state].get(button_size) is None:
-            self.appearance_surface_cages[state][button_size] = (self.get_appearance_by_state(state).
-                                                                 get_appearance_applied_button(self.texture,
-                                                                                               button_size))
-        return self.appearance_surface_cages[state][button_size]
-
-    def blit_button(self, surface: pygame.Surface, center: tuple | np.ndarray, button_size: int, state: str):
+        if type(state) is str or not 0 <= state < len(self._appearances):
+            raise ValueError("unknown state")
+        return self._appearances[state]
+
+    def get_surface(self, button_size: int, state: int, surface_cache: SurfaceCache = None) -> pygame.Surface:
+        """
+        get the rendered surface of the button for a given size and state, rendering it if it is not cached
+        :param button_size: size of the button
+        :param state: state constant
+        :param surface_cache: cache to be used instead of the buttons surface_cache
+        :return: rendered button surface
+        """
+        surface_cache = surface_cache if surface_cache is not None else self.surface_cache
+        appearance = self.get_appearance_by_state(state)
+        key = (self.texture, appearance, button_size)
+
+        surface = surface_cache.get(key)
+        if surface is None:
+            surface = surface_cache.add(key, appearance.get_appearance_applied_button(self.texture, button_size))
+        return surface
+
+    def get_blit_position(self, button_surface: pygame.Surface, center: tuple | np.ndarray) -> tuple[int, int]:
+        """
+        get the position a button surface has to be blitted at to be centered on the given center
+        :param button_surface: surface returned by get_surface
+        :param center: center of the button
+        :return: left upper position
+        """
+        return center[0] - button_surface.get_width() // 2, center[1] - button_surface.get_height() // 2
+
+    def blit_button(self, surface: pygame.Surface, center: tuple | np.ndarray, button_size: int, state: int):
         button_surface = self.get_surface(button_size, state)
-        position = tuple(cent - butt // 2 for cent, butt in zip(center, button_surface.get_size()))
-        surface.blit(button_surface, position)
+        surface.blit(button_surface, self.get_blit_position(button_surface, center))
 
     def call_commands(self):
         """
@@ -166,28 +956,46 @@ class BaseButton:
         arguments if a tuple of callables with more than one argument is provided. If you get a to much or to less
         argument or zip error this is most likely for this reason
         """
+        for command, arguments in self._get_command_calls():
+            command(*arguments)
+
+    async def call_commands_async(self):
+        """
+        equivalent to call_commands, but awaits the results of commands that return awaitables (like coroutine
+        functions)
+        """
+        for command, arguments in self._get_command_calls():
+            result = command(*arguments)
+            if inspect.isawaitable(result):
+                await result
+
+    def _get_command_calls(self) -> typing.Iterator[tuple[typing.Callable, tuple]]:
+        """
+        pair every command with its arguments (see call_commands)
+        :return: iterator of commands and their arguments as tuple
+        """
         if callable(self.commands):
             if self.args is not None:
                 if type(self.args) is tuple:
-                    self.commands(*self.args)
+                    yield self.commands, self.args
                 else:
-                    self.commands(self.args)
+                    yield self.commands, (self.args,)
             else:
-                self.commands()
+                yield self.commands, ()
         else:
             if self.args is None:
                 for command in self.commands:
-                    command()
+                    yield command, ()
                 return None
 
             for command, arguments in zip(self.commands, self.args):
                 if arguments is not None:
                     if type(arguments) is tuple:
-                        command(*arguments)
+                        yield command, arguments
                     else:
-                        command(arguments)
+                        yield command, (arguments,)
                 else:
-                    command()
+                    yield command, ()
 
 
 class Button:
@@ -196,6 +1004,13 @@ class Button:
 
 
 class ButtonArrangement:
+    __slots__ = ("shape", "button_size", "button_padding_size", "border_padding_size", "background_colour",
+                 "surface_cache", "buttons", "arrangement_pointers", "surface_pool", "_surface", "_dirty_indices",
+                 "_pressed_index", "_hovered_index", "_selected_index", "passive_button", "displayed_states",
+                 "updated_indices", "surface_moved", "redrawn_cells", "fallback_button_sizes",
+                 "provisional_indices", "pointer_pressed_indices", "pointer_hovered_indices", "_pointer_pressed_counts",
+                 "_pointer_hovered_counts")
+
     def __init__(self,
                  shape: tuple[int, int],
                  buttons: tuple[BaseButton, ...],
@@ -204,10 +1019,12 @@ class ButtonArrangement:
                  button_padding_size: int = 15,
                  border_padding_size: int = None,
                  passive_buttons: tuple[bool, ...] = None,
-                 background_colour: tuple | np.ndarray = (255, 255, 255)
+                 background_colour: tuple | np.ndarray = (255, 255, 255),
+                 surface_cache: SurfaceCache = None,
+                 surface_pool: SurfacePool = None
                  ):
         """
-        class to store a list of buttons in a given shape
+        class to store a list of buttons in a given shape, its surface is allocated when it is first needed
         :param shape:
         :param buttons:
         :param arrangement_pointers:
@@ -216,6 +1033,8 @@ class ButtonArrangement:
         :param border_padding_size:
         :param passive_buttons:
         :param background_colour:
+        :param surface_cache: cache for the button surfaces, if None the caches of the buttons are used
+        :param surface_pool: pool to take the surface from and to return it to when it is released
         """
         self.shape = shape
         self.button_size = initial_button_size
@@ -223,18 +1042,89 @@ class ButtonArrangement:
         self.border_padding_size = border_padding_size if border_padding_size is not None \
             else math.ceil(button_padding_size / 2)
         self.background_colour = background_colour
+        self.surface_cache = surface_cache
         self.buttons = buttons
         self.arrangement_pointers = arrangement_pointers if arrangement_pointers is not None else ((None,)
                                                                                                    * len(self.buttons))
 
-        self.surface = self.generate_surface()
+        self.surface_pool = surface_pool
+        self._surface: pygame.Surface | None = None
+
+        # indices whose state might differ from their displayed state, only these are revisited by terminate_surface:
+        self._dirty_indices = set(range(len(self.buttons)))
+
+        self._pressed_index = None
+        self._hovered_index = None
+        self._selected_index = None
+        # buttons pressed and hovered by additional pointers (touches), the counts of pointers per index keep
+        # get_button_state independent of the number of pointers:
+        self.pointer_pressed_indices: dict[typing.Hashable, int] = {}
+        self.pointer_hovered_indices: dict[typing.Hashable, int] = {}
+        self._pointer_pressed_counts: dict[int, int] = {}
+        self._pointer_hovered_counts: dict[int, int] = {}
+        # one byte per button, 1 means passive:
+        # coerced to 0 and 1, so that any truthy values (for example numpy bools) are accepted:
+        self.passive_button = array.array("b", (1 if passive else 0 for passive in passive_buttons)) \
+            if passive_buttons is not None else array.array("b", (0,)) * len(self.buttons)
+
+        # state drawn on the surface for every button, NO_STATE if it has not been drawn:
+        self.displayed_states = array.array("b", (NO_STATE,)) * len(self.buttons)
+        self.updated_indices = set()
+        # set when the content of the surface has been moved, so that it has to be blitted completely:
+        self.surface_moved = False
+        self.redrawn_cells = 0
+
+        # previous button sizes, whose cached surfaces are upscaled as placeholders until the new size is rendered:
+        self.fallback_button_sizes: tuple[int, ...] = ()
+        # indices displaying such a placeholder:
+        self.provisional_indices = set()
 
-        self.pressed_index = None
-        self.hovered_index = None
-        self.selected_index = None
-        self.passive_button = passive_buttons if passive_buttons is not None else [False, ] * len(self.buttons)
+    @property
+    def pressed_index(self) -> int | None:
+        return self._pressed_index
 
-        self.displayed_states = [None, ] * len(self.buttons)
+    @pressed_index.setter
+    def pressed_index(self, index: int | None):
+        if index != self._pressed_index:
+            self._mark_dirty(self._pressed_index)
+            self._mark_dirty(index)
+            self._pressed_index = index
+
+    @property
+    def hovered_index(self) -> int | None:
+        return self._hovered_index
+
+    @hovered_index.setter
+    def hovered_index(self, index: int | None):
+        if index != self._hovered_index:
+            self._mark_dirty(self._hovered_index)
+            self._mark_dirty(index)
+            self._hovered_index = index
+
+    @property
+    def selected_index(self) -> int | None:
+        return self._selected_index
+
+    @selected_index.setter
+    def selected_index(self, index: int | None):
+        if index != self._selected_index:
+            self._mark_dirty(self._selected_index)
+            self._mark_dirty(index)
+            self._selected_index = index
+
+    def _mark_dirty(self, index: int | None):
+        if index is not None:
+            self._dirty_indices.add(index)
+
+    def mark_dirty(self, index: int | None = None):
+        """
+        force terminate_surface to revisit a button, needed if passive_button is modified directly
+        :param index: index of the button to be revisited, if None all buttons are revisited
+        """
+        if index is None:
+            self._dirty_indices.update(range(len(self.buttons)))
+        else:
+            self._dirty_indices.add(index)
 
     @property
     def combined_button_size(self):
@@ -244,57 +1134,291 @@ class ButtonArrangement:
         """
         return self.button_padding_size + self.button_size
 
+    @property
+    def surface(self) -> pygame.Surface:
+        """
+        surface showing all buttons of the arrangement, allocated on first access
+        :return: arrangement surface
+        """
+        if self._surface is None:
+            self._surface = self.generate_surface()
+        return self._surface
+
+    @property
+    def has_surface(self) -> bool:
+        """
+        check whether the arrangement surface is currently allocated
+        :return: True if the surface is allocated
+        """
+        return self._surface is not None
+
     def generate_surface(self) -> pygame.Surface:
-        surface_size = tuple(2 * self.border_padding_size - self.button_padding_size +
-                             self.combined_button_size * axis for axis in self.shape)
-        surface = pygame.Surface(surface_size)
+        surface_size = self.get_surface_size()
+        surface = self.surface_pool.acquire(surface_size) if self.surface_pool is not None else None
+        if surface is None:
+            surface = pygame.Surface(surface_size)
         surface.fill(self.background_colour)
         return surface
 
+    def release_surface(self):
+        """
+        free the arrangement surface (or return it to the surface pool), it is generated and redrawn completely when it
+        is needed again
+        """
+        if self._surface is None:
+            return None
+
+        if self.surface_pool is not None:
+            self.surface_pool.release(self._surface)
+        self._surface = None
+        self.reset_displayed_states()
+
+    def reset_displayed_states(self):
+        """
+        forget what has been drawn, so that the next call of terminate_surface redraws every button
+        """
+        self.displayed_states = array.array("b", (NO_STATE,)) * len(self.buttons)
+        self.updated_indices.clear()
+        self.provisional_indices.clear()
+        self.mark_dirty()
+
+    def set_geometry(self,
+                     button_size: int,
+                     button_padding_size: int,
+                     border_padding_size: int,
+                     keep_fallback: bool = True):
+        """
+        change the size of the buttons and paddings, the surface is released and redrawn when it is needed again
+        :param button_size: new button size
+        :param button_padding_size: new space between buttons
+        :param border_padding_size: new space between the buttons and the edge of the surface
+        :param keep_fallback: if True the cached surfaces of the previous button size are upscaled as placeholders
+                              until the surfaces of the new size are rendered (see refine_provisional_surfaces)
+        """
+        if keep_fallback and button_size != self.button_size:
+            self.fallback_button_sizes = (self.button_size,) + tuple(size for size in self.fallback_button_sizes
+                                                                     if size not in (self.button_size, button_size))
+
+        self.release_surface()
+        self.button_size = button_size
+        self.button_padding_size = button_padding_size
+        self.border_padding_size = border_padding_size
+
+    @property
+    def visible_shape(self) -> tuple[int, int]:
+        """
+        number of cells along x and y-axis displayed on the arrangement surface
+        :return: displayed shape
+        """
+        return self.shape
+
+    def get_cell_at_index(self, index: int) -> tuple[int, int]:
+        """
+        get the cell of the arrangement surface the button at the given index is displayed in
+        :param index: index of the button
+        :return: column and row of the cell
+        """
+        return index % self.shape[0], index // self.shape[0]
+
+    def get_index_at_cell(self, column: int, row: int) -> int | None:
+        """
+        get the index of the button displayed in a cell of the arrangement surface
+        :param column: column of the cell, has to be within the visible shape
+        :param row: row of the cell, has to be within the visible shape
+        :return: index of the button or None if no button is displayed in the cell
+        """
+        index = column + row * self.shape[0]
+        return index if index < len(self.buttons) else None
+
+    def get_indices_at_cells(self, columns: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        vectorized get_index_at_cell
+        :param columns: array of columns within the visible shape
+        :param rows: array of rows within the visible shape
+        :return: array of indices, -1 where no button is displayed
+        """
+        indices = columns + rows * self.shape[0]
+        return np.where(indices < len(self.buttons), indices, -1)
+
     def _get_center_at_index(self, index: int) -> tuple[int, int]:
-        # print(self.padding_size, self.button_size, self.combined_button_size, index, self.shape)
-        return (self.border_padding_size + self.button_size // 2 + self.combined_button_size * (index % self.shape[0]),
-                self.border_padding_size + self.button_size // 2 + self.combined_button_size * (index // self.shape[0]))
-
-    def _draw_background_at_index(self, index: int):
-        left_up_position = (self.border_padding_size - math.ceil(self.button_padding_size / 2) +
-                            self.combined_button_size * (index % self.shape[0]),
-                            self.border_padding_size - math.ceil(self.button_padding_size / 2) +
-                            self.combined_button_size * (index // self.shape[0]))
+        column, row = self.get_cell_at_index(index)
+        return (self.border_padding_size + self.button_size // 2 + self.combined_button_size * column,
+                self.border_padding_size + self.button_size // 2 + self.combined_button_size * row)
+
+    def _get_left_up_position_at_index(self, index: int) -> tuple[int, int]:
+        column, row = self.get_cell_at_index(index)
+        return (self.border_padding_size - math.ceil(self.button_padding_size / 2) + self.combined_button_size * column,
+                self.border_padding_size - math.ceil(self.button_padding_size / 2) + self.combined_button_size * row)
+
+    def _draw_background_at_index(self, index: int, target: pygame.Surface = None, offset: tuple[int, int] = (0, 0)):
         size = (self.combined_button_size,) * 2
-        pygame.draw.rect(self.surface, self.background_colour, left_up_position + size)
+        if target is None:
+            self.surface.fill(self.background_colour, self._get_left_up_position_at_index(index) + size)
+        else:
+            target.fill(self.background_colour, self.get_rect_at_index(index).move(offset))
 
-    def _blit_button(self, index: int, state: str):
-        self.buttons[index].blit_button(self.surface,
-                                        self._get_center_at_index(index),
-                                        self.button_size,
-                                        state)
+    def get_rect_at_index(self, index: int) -> pygame.Rect:
+        """
+        get the area of the arrangement surface that is redrawn when the button at the given index changes its state
+        :param index: index of the button
+        :return: rect relative to the arrangement surface, clipped to the surface
+        """
+        return pygame.Rect(self._get_left_up_position_at_index(index),
+                           (self.combined_button_size,) * 2).clip(((0, 0), self.get_surface_size()))
+
+    def _get_button_blit(self, index: int, state: int) -> tuple[pygame.Surface, tuple[int, int]]:
+        button = self.buttons[index]
+        surface_cache = self.surface_cache if self.surface_cache is not None else button.surface_cache
+
+        button_surface = self._get_provisional_surface(button, state, surface_cache) \
+            if self.fallback_button_sizes else None
+        if button_surface is None:
+            button_surface = button.get_surface(self.button_size, state, surface_cache)
+            self.provisional_indices.discard(index)
+        else:
+            self.provisional_indices.add(index)
+        return button_surface, button.get_blit_position(button_surface, self._get_center_at_index(index))
+
+    def _get_provisional_surface(self,
+                                 button: BaseButton,
+                                 state: int,
+                                 surface_cache: SurfaceCache) -> pygame.Surface | None:
+        """
+        get a nearest neighbour upscale of a cached surface of a previous button size, if the surface of the current
+        size is not cached yet
+        :param button: button to get the surface of
+        :param state: state of the button
+        :param surface_cache: cache the surfaces are looked up in
+        :return: placeholder surface or None if the surface of the current size is cached or no fallback is cached
+        """
+        appearance = button.get_appearance_by_state(state)
+        if (button.texture, appearance, self.button_size) in surface_cache:
+            return None
+
+        for fallback_size in self.fallback_button_sizes:
+            if (button.texture, appearance, fallback_size) in surface_cache:
+                # the surface of the current size is still missing, so the placeholder is not counted as hit:
+                fallback_surface = surface_cache.get((button.texture, appearance, fallback_size), count=False)
+                scaled_size = tuple(max(1, round(axis * self.button_size / fallback_size))
+                                    for axis in fallback_surface.get_size())
+                return pygame.transform.scale(fallback_surface, scaled_size)
+        return None
+
+    def refine_provisional_surfaces(self, time_budget: float | None = None, start: float = None) -> bool:
+        """
+        render the surfaces of the current button size for the cells showing placeholders and mark the cells to be
+        redrawn by the next call of terminate_surface
+        :param time_budget: time in seconds that may be spent on rendering, None means no limit
+        :param start: time (time.perf_counter) the budget started at, defaults to now
+        :return: True if no cell shows a placeholder anymore
+        """
+        start = start if start is not None else time.perf_counter()
+        for index in sorted(self.provisional_indices):
+            if time_budget is not None and time.perf_counter() - start >= time_budget:
+                break
+
+            self.provisional_indices.discard(index)
+            state = self.displayed_states[index]
+            if state == NO_STATE:
+                # the cell has been scrolled out of view or released since:
+                continue
+
+            button = self.buttons[index]
+            surface_cache = self.surface_cache if self.surface_cache is not None else button.surface_cache
+            button.get_surface(self.button_size, state, surface_cache)
+
+            self.displayed_states[index] = NO_STATE
+            self._dirty_indices.add(index)
+        return not self.provisional_indices
+
+    def warm_surfaces(self, time_budget: float | None = None) -> bool:
+        """
+        render the surfaces of the current states of all buttons that are not cached yet, without drawing them
+        :param time_budget: time in seconds that may be spent on rendering, None means no limit
+        :return: True if all surfaces are cached
+        """
+        start = time.perf_counter()
+        for index, button in enumerate(self.buttons):
+            state = self.get_button_state(index)
+            surface_cache = self.surface_cache if self.surface_cache is not None else button.surface_cache
+            if (button.texture, button.get_appearance_by_state(state), self.button_size) in surface_cache:
+                continue
+            if time_budget is not None and time.perf_counter() - start >= time_budget:
+                return False
+            button.get_surface(self.button_size, state, surface_cache)
+        return True
 
     def get_button_state(self, index: int):
         if self.passive_button[index]:
             return PASSIVE_STATE
 
-        if self.pressed_index == index:
+        if self.pressed_index == index or index in self._pointer_pressed_counts:
             return PRESSED_STATE
 
         if self.selected_index == index:
             return SELECTED_STATE
 
-        if self.hovered_index == index:
+        if self.hovered_index == index or index in self._pointer_hovered_counts:
             return HOVERED_STATE
 
         return NORMAL_STATE
 
-    def terminate_surface(self) -> bool:
-        updated = False
-        for index, displayed_state in enumerate(self.displayed_states):
-            button_state = self.get_button_state(index)
-            if button_state != displayed_state:
-                updated = True
-                self._draw_background_at_index(index)
-                self._blit_button(index, button_state)
-                self.displayed_states[index] = button_state
-        return updated
+    def terminate_surface(self,
+                          time_budget: float | None = None,
+                          target: pygame.Surface = None,
+                          offset: tuple[int, int] = (0, 0)) -> bool:
+        """
+        redraw the buttons whose state differs from their displayed state
+        :param time_budget: time in seconds that may be spent on redrawing, buttons that could not be redrawn within the
+                            budget are redrawn by the next call, None means no limit
+        :param target: if specified the buttons are drawn straight onto this surface at the given offset instead of the
+                       arrangement surface, which is not allocated then (the target has to keep the drawn pixels)
+        :param offset: position of the arrangement on the target
+        :return: True if the surface has changed
+        """
+        if not self._dirty_indices:
+            return False
+
+        dirty_indices = sorted(self._dirty_indices)
+        if time_budget is None:
+            self._dirty_indices.clear()
+        start = time.perf_counter()
+
+        # clear the backgrounds first and blit all changed buttons in one batch afterwards, the caches must not evict
+        # the surfaces of the batch (overwriting their atlas pages) before they are blitted:
+        button_blits = []
+        deferred_caches = set()
+        try:
+            for index in dirty_indices:
+                if time_budget is not None:
+                    if time.perf_counter() - start >= time_budget:
+                        break
+                    self._dirty_indices.discard(index)
+
+                button_state = self.get_button_state(index)
+                if button_state != self.displayed_states[index]:
+                    surface_cache = self.surface_cache if self.surface_cache is not None \
+                        else self.buttons[index].surface_cache
+                    if surface_cache not in deferred_caches:
+                        surface_cache.defer_eviction()
+                        deferred_caches.add(surface_cache)
+
+                    self._draw_background_at_index(index, target, offset)
+                    button_surface, blit_position = self._get_button_blit(index, button_state)
+                    button_blits.append((button_surface, (blit_position[0] + offset[0], blit_position[1] + offset[1])))
+                    self.displayed_states[index] = button_state
+                    self.updated_indices.add(index)
+
+            if not button_blits:
+                return False
+
+            (target if target is not None else self.surface).fblits(button_blits)
+        finally:
+            for surface_cache in deferred_caches:
+                surface_cache.resume_eviction()
+
+        self.redrawn_cells += len(button_blits)
+        return True
 
     def _set_hovered(self, index: int | None):
         if index is None:
@@ -350,27 +1474,109 @@ class ButtonArrangement:
         if set_selected and (self.pressed_index == index or (always_set_selected and self.pressed_index is not None)):
             self.set_selected(self.pressed_index)
 
-        self.pressed_index = None
+        self.pressed_index = None
+
+    def _set_pointer_index(self,
+                           pointer_indices: dict[typing.Hashable, int],
+                           counts: dict[int, int],
+                           pointer: typing.Hashable,
+                           index: int | None):
+        previous_index = pointer_indices.pop(pointer, None)
+        if previous_index == index:
+            if index is not None:
+                pointer_indices[pointer] = index
+            return None
+
+        if previous_index is not None:
+            counts[previous_index] -= 1
+            if not counts[previous_index]:
+                del counts[previous_index]
+            self._dirty_indices.add(previous_index)
+
+        if index is not None:
+            pointer_indices[pointer] = index
+            counts[index] = counts.get(index, 0) + 1
+            self._dirty_indices.add(index)
+
+    def set_pointer_hovered(self, pointer: typing.Hashable, index: int | None):
+        """
+        set the button an additional pointer is above, every pointer hovers at most one button
+        :param pointer: id of the pointer (for example touch and finger id of a touch)
+        :param index: index of the hovered button or None
+        """
+        self._set_pointer_index(self.pointer_hovered_indices, self._pointer_hovered_counts, pointer,
+                                None if index is None or self.passive_button[index] else index)
+
+    def set_pointer_pressed(self, pointer: typing.Hashable, index: int | None):
+        """
+        set the button an additional pointer presses, several pointers can press different buttons at the same time
+        :param pointer: id of the pointer (for example touch and finger id of a touch)
+        :param index: index of the pressed button or None
+        """
+        self._set_pointer_index(self.pointer_pressed_indices, self._pointer_pressed_counts, pointer,
+                                None if index is None or self.passive_button[index] else index)
+
+    def pointer_up(self,
+                   pointer: typing.Hashable,
+                   index: int | None,
+                   set_selected: bool = False,
+                   always_set_selected: bool = False) -> int | None:
+        """
+        release an additional pointer (see mouse_up)
+        :param pointer: id of the pointer
+        :param index: index of the button the pointer is released above or None
+        :param set_selected: if True the pressed button is selected if the pointer is released above it
+        :param always_set_selected: if True the pressed button is selected wherever the pointer is released
+        :return: index of the button the pointer has pressed or None
+        """
+        pressed_index = self.pointer_pressed_indices.get(pointer)
+        if set_selected and pressed_index is not None and (pressed_index == index or always_set_selected):
+            self.set_selected(pressed_index)
+
+        self._set_pointer_index(self.pointer_pressed_indices, self._pointer_pressed_counts, pointer, None)
+        self._set_pointer_index(self.pointer_hovered_indices, self._pointer_hovered_counts, pointer, None)
+        return pressed_index
+
+    def release_pointers(self):
+        """
+        release all additional pointers without selecting their buttons
+        """
+        self._dirty_indices.update(self._pointer_pressed_counts)
+        self._dirty_indices.update(self._pointer_hovered_counts)
+        self.pointer_pressed_indices.clear()
+        self.pointer_hovered_indices.clear()
+        self._pointer_pressed_counts.clear()
+        self._pointer_hovered_counts.clear()
 
     def set_passive(self, index: int):
         if self.pressed_index == index:
             self.pressed_index = None
         if self.hovered_index == index:
             self.hovered_index = None
+        if index in self._pointer_pressed_counts or index in self._pointer_hovered_counts:
+            for pointer in [pointer for pointer, pressed in self.pointer_pressed_indices.items() if pressed == index]:
+                self._set_pointer_index(self.pointer_pressed_indices, self._pointer_pressed_counts, pointer, None)
+            for pointer in [pointer for pointer, hovered in self.pointer_hovered_indices.items() if hovered == index]:
+                self._set_pointer_index(self.pointer_hovered_indices, self._pointer_hovered_counts, pointer, None)
 
-        self.passive_button[index] = True
+        self.passive_button[index] = 1
+        self._dirty_indices.add(index)
 
     def set_active(self, index: int):
-        self.passive_button[index] = False
+        self.passive_button[index] = 0
+        self._dirty_indices.add(index)
 
     def set_all_passive(self):
         self.pressed_index = None
         self.hovered_index = None
+        self.release_pointers()
 
-        self.passive_button = [True, ] * len(self.passive_button)
+        self._dirty_indices.update(index for index, passive in enumerate(self.passive_button) if not passive)
+        self.passive_button = array.array("b", (1,)) * len(self.passive_button)
 
     def set_all_active(self):
-        self.passive_button = [False, ] * len(self.passive_button)
+        self._dirty_indices.update(index for index, passive in enumerate(self.passive_button) if passive)
+        self.passive_button = array.array("b", (0,)) * len(self.passive_button)
 
     def get_button_at_index(self, index: int) -> BaseButton | None:
         if index >= len(self.buttons):
@@ -382,8 +1588,186 @@ class ButtonArrangement:
             return None
         return self.arrangement_pointers[index]
 
-    def get_surface_size(self):
-        return self.surface.get_size()
+    def get_surface_size(self) -> tuple[int, int]:
+        return tuple(2 * self.border_padding_size - self.button_padding_size +
+                     self.combined_button_size * axis for axis in self.visible_shape)
+
+
+class ScrollableButtonArrangement(ButtonArrangement):
+    __slots__ = ("viewport_shape", "scroll_position", "_scrolled")
+
+    def __init__(self,
+                 shape: tuple[int, int],
+                 buttons: tuple[BaseButton, ...],
+                 arrangement_pointers: tuple[str, ...] | None,
+                 initial_button_size: int,
+                 viewport_shape: tuple[int, int],
+                 button_padding_size: int = 15,
+                 border_padding_size: int = None,
+                 passive_buttons: tuple[bool, ...] = None,
+                 background_colour: tuple | np.ndarray = (255, 255, 255),
+                 surface_cache: SurfaceCache = None,
+                 surface_pool: SurfacePool = None
+                 ):
+        """
+        ButtonArrangement of which only a window of viewport_shape cells is displayed and rendered, its surface has the
+        size of this window, so that memory and render cost do not depend on the number of buttons
+        :param shape: number of buttons along x and y-axis of the whole arrangement
+        :param buttons: (see ButtonArrangement)
+        :param arrangement_pointers: (see ButtonArrangement)
+        :param initial_button_size: (see ButtonArrangement)
+        :param viewport_shape: number of displayed buttons along x and y-axis
+        :param button_padding_size: (see ButtonArrangement)
+        :param border_padding_size: (see ButtonArrangement)
+        :param passive_buttons: (see ButtonArrangement)
+        :param background_colour: (see ButtonArrangement)
+        :param surface_cache: (see ButtonArrangement)
+        :param surface_pool: (see ButtonArrangement)
+        """
+        self.viewport_shape = tuple(min(viewport, axis) for viewport, axis in zip(viewport_shape, shape))
+        self.scroll_position = (0, 0)
+        self._scrolled = False
+
+        super().__init__(shape=shape,
+                         buttons=buttons,
+                         arrangement_pointers=arrangement_pointers,
+                         initial_button_size=initial_button_size,
+                         button_padding_size=button_padding_size,
+                         border_padding_size=border_padding_size,
+                         passive_buttons=passive_buttons,
+                         background_colour=background_colour,
+                         surface_cache=surface_cache,
+                         surface_pool=surface_pool)
+
+    @property
+    def visible_shape(self) -> tuple[int, int]:
+        return self.viewport_shape
+
+    @property
+    def max_scroll_position(self) -> tuple[int, int]:
+        """
+        get the highest first displayed column and row
+        :return: highest scroll position
+        """
+        return self.shape[0] - self.viewport_shape[0], self.shape[1] - self.viewport_shape[1]
+
+    def get_cell_at_index(self, index: int) -> tuple[int, int]:
+        return (index % self.shape[0] - self.scroll_position[0],
+                index // self.shape[0] - self.scroll_position[1])
+
+    def get_index_at_cell(self, column: int, row: int) -> int | None:
+        return super().get_index_at_cell(column + self.scroll_position[0], row + self.scroll_position[1])
+
+    def get_indices_at_cells(self, columns: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        return super().get_indices_at_cells(columns + self.scroll_position[0], rows + self.scroll_position[1])
+
+    def is_index_visible(self, index: int) -> bool:
+        """
+        check whether the button at the given index is displayed at the current scroll position
+        :param index: index of the button
+        :return: True if the button is displayed
+        """
+        column, row = self.get_cell_at_index(index)
+        return 0 <= column < self.viewport_shape[0] and 0 <= row < self.viewport_shape[1]
+
+    def get_visible_indices(self) -> list[int]:
+        """
+        get the indices of all buttons displayed at the current scroll position
+        :return: list of indices
+        """
+        first_column, first_row = self.scroll_position
+        return [index
+                for row in range(first_row, first_row + self.viewport_shape[1])
+                for index in range(row * self.shape[0] + first_column,
+                                   min(row * self.shape[0] + first_column + self.viewport_shape[0], len(self.buttons)))]
+
+    def terminate_surface(self,
+                          time_budget: float | None = None,
+                          target: pygame.Surface = None,
+                          offset: tuple[int, int] = (0, 0)) -> bool:
+        # buttons outside the viewport are redrawn when they are scrolled into it:
+        if self._dirty_indices:
+            self._dirty_indices = {index for index in self._dirty_indices if self.is_index_visible(index)}
+
+        scrolled = self._scrolled
+        self._scrolled = False
+        return super().terminate_surface(time_budget, target, offset) or scrolled
+
+    def scroll(self, columns: int, rows: int) -> bool:
+        """
+        move the displayed window by the given number of columns and rows (see scroll_to)
+        :param columns: number of columns to scroll to the right
+        :param rows: number of rows to scroll down
+        :return: True if the scroll position has changed
+        """
+        return self.scroll_to(self.scroll_position[0] + columns, self.scroll_position[1] + rows)
+
+    def scroll_to(self, first_column: int, first_row: int) -> bool:
+        """
+        set the first displayed column and row, the pixels of buttons staying visible are moved on the surface and only
+        the newly exposed buttons are rendered by the next call of terminate_surface
+        :param first_column: first displayed column, clamped to the valid range
+        :param first_row: first displayed row, clamped to the valid range
+        :return: True if the scroll position has changed
+        """
+        new_position = (max(0, min(first_column, self.max_scroll_position[0])),
+                        max(0, min(first_row, self.max_scroll_position[1])))
+        delta = (new_position[0] - self.scroll_position[0], new_position[1] - self.scroll_position[1])
+        if delta == (0, 0):
+            return False
+
+        previously_visible = set(self.get_visible_indices())
+        self.scroll_position = new_position
+        visible = self.get_visible_indices()
+
+        for index in previously_visible.difference(visible):
+            self.displayed_states[index] = NO_STATE
+
+        if self._surface is not None:
+            self._surface.scroll(-delta[0] * self.combined_button_size, -delta[1] * self.combined_button_size)
+            self._clear_outside_of_cells(delta)
+
+        for index in visible:
+            if index not in previously_visible:
+                self.displayed_states[index] = NO_STATE
+                self._dirty_indices.add(index)
+
+        self.surface_moved = True
+        self._scrolled = True
+        return True
+
+    def _clear_outside_of_cells(self, delta: tuple[int, int]):
+        """
+        fill the border paddings and the cells exposed by scrolling by the given delta with the background colour
+        :param delta: scrolled columns and rows
+        """
+        width, height = self._surface.get_size()
+        cell_offset = self.border_padding_size - math.ceil(self.button_padding_size / 2)
+        cells_end = (cell_offset + self.combined_button_size * self.viewport_shape[0],
+                     cell_offset + self.combined_button_size * self.viewport_shape[1])
+        exposed_columns = min(abs(delta[0]), self.viewport_shape[0]) * self.combined_button_size
+        exposed_rows = min(abs(delta[1]), self.viewport_shape[1]) * self.combined_button_size
+
+        areas = [(0, 0, width, max(0, cell_offset)),
+                 (0, cells_end[1], width, height - cells_end[1]),
+                 (0, 0, max(0, cell_offset), height),
+                 (cells_end[0], 0, width - cells_end[0], height)]
+        if delta[0] > 0:
+            areas.append((cells_end[0] - exposed_columns, 0, exposed_columns, height))
+        elif delta[0] < 0:
+            areas.append((cell_offset, 0, exposed_columns, height))
+        if delta[1] > 0:
+            areas.append((0, cells_end[1] - exposed_rows, width, exposed_rows))
+        elif delta[1] < 0:
+            areas.append((0, cell_offset, width, exposed_rows))
+
+        for area in areas:
+            if area[2] > 0 and area[3] > 0:
+                self._surface.fill(self.background_colour, area)
+
+
+# all existing ButtonBoxes, a rescaled box must not evict the surfaces of sizes other boxes sharing its caches use:
+_button_boxes: weakref.WeakSet = weakref.WeakSet()
 
 
 class ButtonBox:
@@ -394,7 +1778,16 @@ class ButtonBox:
                  border_padding_size: int = None,
                  selected_mode: bool = False,
                  background_colour: tuple[int, ...] | np.ndarray = (255, 255, 255),
-                 process_not_longer_touched_buttons: bool = False
+                 process_not_longer_touched_buttons: bool = False,
+                 partial_blit: bool = False,
+                 coalesce_motion_events: bool = False,
+                 surface_cache: SurfaceCache = None,
+                 release_hidden_arrangements: bool = False,
+                 command_executor: CommandExecutor = None,
+                 passive_while_running: bool = False,
+                 predictive_time_budget: float | None = None,
+                 direct_rendering: bool = False,
+                 multi_touch: bool = False
                  ):
         """
         container for pressable buttons
@@ -407,7 +1800,34 @@ class ButtonBox:
         :param process_not_longer_touched_buttons: if argument is truthy pressed buttons that are no longer hovered
                                                    over will be processed anyway, meaning that their commands and
                                                    pointers will be called
+        :param partial_blit: if argument is truthy blit_if_necessary only blits the buttons that were redrawn since the
+                             last blit instead of the whole arrangement surface, the returned rects can be handed to
+                             pygame.display.update
+        :param coalesce_motion_events: if argument is truthy only the last of consecutive MOUSEMOTION events is
+                                       processed by run_logic, as the ones before it do not change the result
+        :param surface_cache: cache for the surfaces of all buttons in this ButtonBox, if None the caches of the buttons
+                              are used. A SurfaceCache with a SurfaceAtlas packs the surfaces of the box into a few
+                              atlas pages
+        :param release_hidden_arrangements: if argument is truthy the surface of an arrangement is released as soon as
+                                            another arrangement is displayed and kept in a pool to be reused by the
+                                            next arrangement of the same shape
+        :param command_executor: if specified the commands of the buttons are run by this executor instead of being
+                                 called inside run_logic (can be overwritten by the buttons command_executor)
+        :param passive_while_running: if argument is truthy buttons are passive while their commands are run by an
+                                      executor (can be overwritten by the buttons passive_while_running)
+        :param predictive_time_budget: if specified, while a button with an arrangement pointer is hovered or pressed,
+                                       up to this time in seconds per call of run_logic is spent on drawing the surface
+                                       of the arrangement it points to, so that switching to it only needs a blit
+        :param direct_rendering: if argument is truthy changed buttons are drawn straight onto the surface given to
+                                 blit_if_necessary instead of being drawn onto an arrangement surface first, which is
+                                 not allocated then. Only usable if the ButtonBox is always blitted on the same surface
+                                 at the same position and the surface is not cleared in between (use force_blit
+                                 otherwise)
+        :param multi_touch: if argument is truthy FINGERDOWN, FINGERMOTION and FINGERUP events are handled, every touch
+                            presses and hovers its own button independently of the others, mouse events emulated from
+                            touches are ignored then
         """
+        _button_boxes.add(self)
         self.button_layout_size = button_layout_size
         self.button_size = button_size
         self.button_padding_size = button_padding_size
@@ -422,9 +1842,41 @@ class ButtonBox:
         self.current_button_arrangement: ButtonArrangement | None = None
 
         self.process_not_longer_touched_buttons = process_not_longer_touched_buttons
+        self.partial_blit = partial_blit
+        self.coalesce_motion_events = coalesce_motion_events
+        self.surface_cache = surface_cache
+        self.release_hidden_arrangements = release_hidden_arrangements
+        self.surface_pool = SurfacePool()
+        self.command_executor = command_executor
+        self.passive_while_running = passive_while_running
+        self._used_executors: set[CommandExecutor] = set()
+        self.predictive_time_budget = predictive_time_budget
+        self.direct_rendering = direct_rendering
+        self.multi_touch = multi_touch
 
         self.reload_surface = True
         self.updated_buttons = False
+        self._displayed_arrangement: ButtonArrangement | None = None
+
+        self.statistics: BoxStatistics | None = None
+        self._pointer_position: tuple[int, int] | None = None
+
+        # frames with at least this many events are hit tested in one vectorized computation (see
+        # get_indices_at_positions), below it the per-event computation is faster, None disables batch hit testing:
+        self.batch_hit_test_threshold = 48
+
+        self.prewarm_time_budget = None
+        self._prewarm_queue: collections.deque[tuple[BaseButton, int, int]] = collections.deque()
+
+        # geometry at scale 1 (see set_scale):
+        self.scale = 1
+        self._base_button_size = button_size
+        self._base_button_padding_size = button_padding_size
+        self._base_border_padding_size = self.border_padding_size
+
+        # previous button sizes whose surfaces are evicted as soon as all surfaces of the new size are rendered:
+        self._replaced_button_sizes: set[int] = set()
+        self.rescale_time_budget = None
 
     @property
     def combined_button_size(self) -> int:
@@ -463,7 +1915,10 @@ class ButtonBox:
                                arrangement_shape: tuple[int, int],
                                buttons: tuple[BaseButton, ...],
                                arrangement_pointers: tuple[str | None, ...] | None = None,
-                               passive_buttons: tuple[bool, ...] = None):
+                               passive_buttons: tuple[bool, ...] = None,
+                               prewarm: bool = False,
+                               prewarm_time_budget: float | None = None,
+                               viewport_shape: tuple[int, int] = None):
         """
         method to create a new ButtonArrangement within ButtonBox
         :param name: name of the added ButtonArrangement that can be referred to in arrangement pointers
@@ -481,29 +1936,200 @@ class ButtonBox:
         :param passive_buttons: tuple of equal length as the buttons argument or None. If a tuple is provided each
                                 boolean value within this tuple determines whether the associated button should be
                                 passive
+        :param prewarm: if True the surfaces of all states of the added buttons are rendered in advance, so that the
+                        first interaction with a button does not have to render them (see prewarm method)
+        :param prewarm_time_budget: time in seconds that may be spent on pre-warming per call of run_logic, if None all
+                                    surfaces are rendered immediately
+        :param viewport_shape: if specified a scrollable arrangement is created, that displays only viewport_shape
+                               buttons of the arrangement_shape at once (see ScrollableButtonArrangement), in this case
+                               the viewport_shape instead of the arrangement_shape has to fit into the layout size
         """
-        if any(shape > layout for shape, layout in zip(arrangement_shape, self.button_layout_size)):
-            raise ValueError(f"ButtonArrangement shape {arrangement_shape} "
+        displayed_shape = viewport_shape if viewport_shape is not None else arrangement_shape
+        if any(shape > layout for shape, layout in zip(displayed_shape, self.button_layout_size)):
+            raise ValueError(f"ButtonArrangement shape {displayed_shape} "
                              f"is not compatible with layout size {self.button_layout_size}")
 
-        self.button_arrangements[name] = ButtonArrangement(shape=arrangement_shape,
-                                                           buttons=buttons,
-                                                           arrangement_pointers=arrangement_pointers,
-                                                           initial_button_size=self.button_size,
-                                                           button_padding_size=self.button_padding_size,
-                                                           border_padding_size=self.border_padding_size,
-                                                           passive_buttons=passive_buttons,
-                                                           background_colour=self.background_colour)
+        arrangement_arguments = dict(shape=arrangement_shape,
+                                     buttons=buttons,
+                                     arrangement_pointers=arrangement_pointers,
+                                     initial_button_size=self.button_size,
+                                     button_padding_size=self.button_padding_size,
+                                     border_padding_size=self.border_padding_size,
+                                     passive_buttons=passive_buttons,
+                                     background_colour=self.background_colour,
+                                     surface_cache=self.surface_cache,
+                                     surface_pool=self.surface_pool)
+
+        if viewport_shape is not None:
+            self.button_arrangements[name] = ScrollableButtonArrangement(viewport_shape=viewport_shape,
+                                                                         **arrangement_arguments)
+        else:
+            self.button_arrangements[name] = ButtonArrangement(**arrangement_arguments)
 
         if self.current_button_arrangement is None:
             self.current_button_arrangement = self.button_arrangements[name]
 
+        if self.statistics is not None:
+            self.statistics.update_surface_caches()
+
+        if prewarm:
+            self.prewarm(prewarm_time_budget, (name,))
+
+    def prewarm(self, time_budget: float | None = None, names: tuple[str, ...] = None) -> bool:
+        """
+        render the surfaces of every state of every button in advance to avoid rendering them on first interaction
+        :param time_budget: time in seconds that may be spent on pre-warming per call, the surfaces that could not be
+                            rendered within the budget are rendered in the following calls of run_logic. If None all
+                            surfaces are rendered immediately
+        :param names: names of the arrangements to pre-warm, if None all arrangements are pre-warmed
+        :return: True if all surfaces have been rendered
+        """
+        names = names if names is not None else tuple(self.button_arrangements)
+        queued = set(self._prewarm_queue)
+        for name in names:
+            arrangement = self.button_arrangements[name]
+            for button in arrangement.buttons:
+                for state in ALL_STATES:
+                    entry = (button, state, arrangement.button_size)
+                    if entry not in queued:
+                        queued.add(entry)
+                        self._prewarm_queue.append(entry)
+
+        self.prewarm_time_budget = time_budget
+        return self._process_prewarm_queue()
+
+    @property
+    def prewarm_finished(self) -> bool:
+        """
+        check whether all surfaces queued for pre-warming have been rendered
+        :return: True if there are no surfaces left to pre-warm
+        """
+        return not self._prewarm_queue
+
+    def _process_prewarm_queue(self) -> bool:
+        """
+        render queued surfaces until the queue is empty or the pre-warm time budget is used up
+        :return: True if the queue is empty
+        """
+        start = time.perf_counter()
+        while self._prewarm_queue:
+            button, state, button_size = self._prewarm_queue.popleft()
+            button.get_surface(button_size, state, self.surface_cache)
+
+            if self.prewarm_time_budget is not None and time.perf_counter() - start >= self.prewarm_time_budget:
+                break
+        return not self._prewarm_queue
+
+    def set_scale(self, scale: float, time_budget: float | None = 0.004):
+        """
+        scale button size and paddings relative to the values the ButtonBox was created with (see set_button_size)
+        :param scale: new scale, 1 means the initial size
+        :param time_budget: (see set_button_size)
+        """
+        self.scale = scale
+        self._set_geometry(max(1, round(self._base_button_size * scale)),
+                           round(self._base_button_padding_size * scale),
+                           round(self._base_border_padding_size * scale),
+                           time_budget)
+
+    def set_button_size(self, button_size: int, time_budget: float | None = 0.004):
+        """
+        change the button size without rebuilding the ButtonBox, until the surfaces of the new size are rendered the
+        cached surfaces of the previous size are shown with a fast nearest neighbour upscale, they are replaced by high
+        quality renders in the following calls of run_logic and evicted from the surface caches afterwards
+        :param button_size: new button size
+        :param time_budget: time in seconds that may be spent on rendering the new surfaces per call of run_logic, if
+                            None everything is rendered at once and no placeholders are shown
+        (the ButtonBox is blitted completely on the next blit, uncovered areas of its previous size are not cleared)
+        """
+        self._base_button_size = button_size / self.scale
+        self._set_geometry(button_size, self.button_padding_size, self.border_padding_size, time_budget)
+
+    def _set_geometry(self,
+                      button_size: int,
+                      button_padding_size: int,
+                      border_padding_size: int,
+                      time_budget: float | None):
+        """
+        apply new button and padding sizes to the ButtonBox and all its arrangements (see set_button_size)
+        """
+        if button_size != self.button_size:
+            self._replaced_button_sizes.add(self.button_size)
+        self._replaced_button_sizes.discard(button_size)
+
+        self.button_size = button_size
+        self.button_padding_size = button_padding_size
+        self.border_padding_size = border_padding_size
+        self.size = self._get_surface_size(self.button_layout_size)
+
+        for arrangement in self.button_arrangements.values():
+            arrangement.set_geometry(button_size, button_padding_size, border_padding_size, time_budget is not None)
+
+        # pooled surfaces and queued pre-warm entries have the old size:
+        self.surface_pool.clear()
+        self._prewarm_queue = collections.deque(entry for entry in self._prewarm_queue if entry[2] == button_size)
+        self.reload_surface = True
+
+        self.rescale_time_budget = time_budget
+        if time_budget is None:
+            self._evict_replaced_button_sizes()
+        else:
+            self.prewarm(time_budget)
+
+    def _process_rescale(self) -> bool:
+        """
+        replace placeholders by high quality surfaces within the rescale time budget, the current arrangement first,
+        and evict the surfaces of the replaced sizes once everything of the new size is rendered
+        :return: True if the rescaling is finished
+        """
+        start = time.perf_counter()
+        arrangements = [self.current_button_arrangement] + [arrangement for arrangement
+                                                            in self.button_arrangements.values()
+                                                            if arrangement is not self.current_button_arrangement]
+        for arrangement in arrangements:
+            if not arrangement.refine_provisional_surfaces(self.rescale_time_budget, start):
+                return False
+
+        # the surfaces of hidden arrangements are rendered by the pre-warm queue:
+        if self._prewarm_queue:
+            return False
+
+        self._evict_replaced_button_sizes()
+        return True
+
+    def _evict_replaced_button_sizes(self):
+        """
+        remove the surfaces of the replaced button sizes from the surface caches, sizes still displayed by other boxes
+        or used as their placeholders are kept (they are left to the byte budget of the caches)
+        """
+        used_button_sizes = {button_size for box in _button_boxes if box is not self
+                             for arrangement in box.button_arrangements.values()
+                             for button_size in (arrangement.button_size, *arrangement.fallback_button_sizes)}
+        evicted_button_sizes = self._replaced_button_sizes - used_button_sizes
+
+        for arrangement in self.button_arrangements.values():
+            arrangement.fallback_button_sizes = ()
+            if not evicted_button_sizes:
+                continue
+            for button in arrangement.buttons:
+                surface_cache = self.surface_cache if self.surface_cache is not None else button.surface_cache
+                for state in ALL_STATES:
+                    appearance = button.get_appearance_by_state(state)
+                    for button_size in evicted_button_sizes:
+                        surface_cache.remove((button.texture, appearance, button_size))
+        self._replaced_button_sizes.clear()
+
     def set_current_arrangement(self, name: str):
         """
-        set the arrangement with the given name to be the current arrangement used
+        set the arrangement with the given name to be the current arrangement used, on the next blit only the cells that
+        differ from the previously blitted arrangement are redrawn
         :param name: name of the arrangement (see in add_button_arrangement name argument documentation)
         """
-        self.current_button_arrangement = self.button_arrangements[name]
+        arrangement = self.button_arrangements[name]
+        if self.current_button_arrangement is not None and self.current_button_arrangement is not arrangement:
+            # the touches would never be released, as their FINGERUP events only reach the current arrangement:
+            self.current_button_arrangement.release_pointers()
+        self.current_button_arrangement = arrangement
 
     def get_index_at_position(self, position: tuple[int, ...]) -> int | None:
         """
@@ -511,46 +2137,159 @@ class ButtonBox:
         :param position: position on the ButtonBoxes surface (including all border paddings)
         :return: index of the button at the given position or None if there is no button at the given position
         """
-        pos_without_border = tuple(axis - self.border_padding_size for axis in position)
-        button_position = tuple(axis // self.combined_button_size if
-                                axis % self.combined_button_size <= self.button_size else None
-                                for axis in pos_without_border)
+        combined_button_size = self.button_size + self.button_padding_size
+        x = position[0] - self.border_padding_size
+        y = position[1] - self.border_padding_size
 
-        if button_position[0] is None or button_position[1] is None:
+        # positions on the padding between buttons do not hit any button:
+        if x % combined_button_size > self.button_size or y % combined_button_size > self.button_size:
             return None
-        if not all(0 <= axis < shape for axis, shape in zip(button_position, self.arrangement_shape)):
+
+        column = x // combined_button_size
+        row = y // combined_button_size
+        visible_shape = self.current_button_arrangement.visible_shape
+        if not (0 <= column < visible_shape[0] and 0 <= row < visible_shape[1]):
             return None
 
-        index = button_position[0] + button_position[1] * self.arrangement_shape[0]
-        return index if index < len(self.current_button_arrangement.buttons) else None
+        return self.current_button_arrangement.get_index_at_cell(column, row)
+
+    def get_indices_at_positions(self, positions: np.ndarray | list[tuple[int, int]]) -> np.ndarray:
+        """
+        vectorized get_index_at_position, hit testing many positions in one computation (for example all pointer
+        events of a frame or synthetic positions for automated testing)
+        :param positions: array-like of shape (number of positions, 2) with positions on the ButtonBoxes surface
+        :return: array of button indices, -1 for positions that do not hit a button
+        """
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2) - self.border_padding_size
+        cells = positions // self.combined_button_size
+        arrangement = self.current_button_arrangement
+
+        hit = ((positions % self.combined_button_size <= self.button_size).all(axis=1) &
+               (cells >= 0).all(axis=1) & (cells < np.array(arrangement.visible_shape)).all(axis=1))
+        indices = np.full(len(positions), -1, dtype=np.int64)
+        indices[hit] = arrangement.get_indices_at_cells(cells[hit, 0], cells[hit, 1])
+        return indices
+
+    def scroll(self, columns: int, rows: int) -> bool:
+        """
+        scroll the current arrangement, which has to be a ScrollableButtonArrangement
+        :param columns: number of columns to scroll to the right
+        :param rows: number of rows to scroll down
+        :return: True if the scroll position has changed
+        """
+        arrangement = self.current_button_arrangement
+        if not isinstance(arrangement, ScrollableButtonArrangement):
+            raise TypeError("the current arrangement is not scrollable")
+
+        if not arrangement.scroll(columns, rows):
+            return False
+
+        # the pointer is above another button now:
+        if self._pointer_position is not None and arrangement.pressed_index is None:
+            arrangement.set_hovered(self.get_index_at_position(self._pointer_position))
+        return True
+
+    @staticmethod
+    def _coalesce_motion_events(events: list[pygame.Event, ...] | tuple[pygame.Event, ...]) -> list[pygame.Event]:
+        """
+        reduce the events to the mouse button, wheel and touch events and the last MOUSEMOTION event before each of them
+        and at the end
+        :param events: events to be reduced
+        :return: reduced list of events in their original order
+        """
+        coalesced_events = []
+        last_motion_event = None
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                last_motion_event = event
+            elif (event.type == pygame.MOUSEBUTTONDOWN or event.type == pygame.MOUSEBUTTONUP or
+                  event.type == pygame.MOUSEWHEEL or event.type in FINGER_EVENT_TYPES):
+                if last_motion_event is not None:
+                    coalesced_events.append(last_motion_event)
+                    last_motion_event = None
+                coalesced_events.append(event)
+
+        if last_motion_event is not None:
+            coalesced_events.append(last_motion_event)
+        return coalesced_events
 
     def run_logic(self, events: list[pygame.Event, ...] | tuple[pygame.Event, ...], position: tuple):
         """
         method to input the users mouse inputs in form of the associated pygame events
         :param events: list or tuple of events to be handled (MOUSEMOTION, MOUSEBUTTONDOWN and MOUSEBUTTONUP event types
-                       are handled)
+                       are handled, MOUSEWHEEL events scroll scrollable arrangements, FINGERDOWN, FINGERMOTION and
+                       FINGERUP events are handled with multi_touch)
         :param position: position of the ButtonBox on the display
         """
-        for event in events:
+        statistics = self.statistics
+        if statistics is not None:
+            start = time.perf_counter()
+            # lookups are counted on the caches themselves, only the ones inside of this call belong to this box:
+            cache_hits, cache_misses = statistics.get_cache_lookups()
+
+        for executor in tuple(self._used_executors):
+            executor.process_completed()
+            if not executor.running:
+                self._used_executors.discard(executor)
+
+        if self.coalesce_motion_events:
+            events = self._coalesce_motion_events(events)
+
+        batch = None
+        if self.batch_hit_test_threshold is not None and len(events) >= self.batch_hit_test_threshold:
+            batch = self._hit_test_events(events, position, 0)
+
+        def get_index(event_number: int, position_on_surface: tuple[int, int]) -> int | None:
+            nonlocal batch
+            if batch is None:
+                return self.get_index_at_position(position_on_surface)
+            # the indices become invalid when a button switches the arrangement or the arrangement is scrolled:
+            if batch[0] != self._get_hit_test_key():
+                batch = self._hit_test_events(events, position, event_number)
+            index = batch[2][event_number - batch[1]]
+            return int(index) if index >= 0 else None
+
+        for event_number, event in enumerate(events):
+            if self.multi_touch:
+                if event.type in FINGER_EVENT_TYPES:
+                    position_on_surface = tuple(finger_pos - pos for finger_pos, pos in
+                                                zip(get_finger_position(event), position))
+                    self._handle_finger_event(event, get_index(event_number, position_on_surface))
+                    continue
+                # the touches are handled by their own events:
+                if getattr(event, "touch", False):
+                    continue
+
             if event.type == pygame.MOUSEMOTION:
-                # get pressed down button index:
+                # get hovered button index, positions outside the ButtonBox can not hover any button:
                 position_on_surface = tuple(event_pos - pos for event_pos, pos in zip(event.pos, position))
-                button_index = self.get_index_at_position(position_on_surface)
+                if 0 <= position_on_surface[0] < self.size[0] and 0 <= position_on_surface[1] < self.size[1]:
+                    button_index = get_index(event_number, position_on_surface)
+                    self._pointer_position = position_on_surface
+                else:
+                    button_index = None
+                    self._pointer_position = None
 
                 self.current_button_arrangement.set_hovered(button_index)
 
+            elif event.type == pygame.MOUSEWHEEL:
+                # scroll if the pointer is above the ButtonBox:
+                if (self._pointer_position is not None and
+                        isinstance(self.current_button_arrangement, ScrollableButtonArrangement)):
+                    self.scroll(event.x, -event.y)
+
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 # get pressed down button index:
                 position_on_surface = tuple(event_pos - pos for event_pos, pos in zip(event.pos, position))
 
-                button_index = self.get_index_at_position(position_on_surface)
+                button_index = get_index(event_number, position_on_surface)
 
                 self.current_button_arrangement.set_pressed(button_index)
 
             elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 # get pressed down button index:
                 position_on_surface = tuple(event_pos - pos for event_pos, pos in zip(event.pos, position))
-                button_index = self.get_index_at_position(position_on_surface)
+                button_index = get_index(event_number, position_on_surface)
 
                 # get index of button to call, if there is no valid index None should be given
                 index_of_button_to_call = self.current_button_arrangement.pressed_index if (
@@ -562,39 +2301,234 @@ class ButtonBox:
                                                          set_selected=self.selected_mode,
                                                          always_set_selected=self.process_not_longer_touched_buttons)
 
-                if index_of_button_to_call is not None:
-                    # call command:
-                    self.current_button_arrangement.buttons[index_of_button_to_call].call_commands()
+                if index_of_button_to_call is not None and self._process_released_button(index_of_button_to_call):
+                    self.current_button_arrangement.set_hovered(self.get_index_at_position(position_on_surface))
+
+        if self._replaced_button_sizes:
+            self._process_rescale()
+
+        if self.direct_rendering:
+            # the changed buttons are drawn onto the target surface by blit_if_necessary:
+            if statistics is not None:
+                terminate_start = terminate_end = time.perf_counter()
+                redrawn_cells = 0
+        elif statistics is None:
+            self.updated_buttons = self.current_button_arrangement.terminate_surface() or self.updated_buttons
+        else:
+            arrangement = self.current_button_arrangement
+            redrawn_cells = arrangement.redrawn_cells
+            terminate_start = time.perf_counter()
+            self.updated_buttons = arrangement.terminate_surface() or self.updated_buttons
+            terminate_end = time.perf_counter()
+            redrawn_cells = arrangement.redrawn_cells - redrawn_cells
+
+        if self._prewarm_queue:
+            self._process_prewarm_queue()
+
+        if self.predictive_time_budget is not None:
+            self._prerender_pointer_target()
+
+        if statistics is not None:
+            # including the lookups of prewarming and predictive drawing:
+            hits, misses = statistics.get_cache_lookups()
+            statistics.add_logic(time.perf_counter() - start,
+                                 terminate_end - terminate_start,
+                                 redrawn_cells,
+                                 hits - cache_hits,
+                                 misses - cache_misses)
+
+    def _handle_finger_event(self, event: pygame.Event, button_index: int | None):
+        """
+        update the state of the touch an event belongs to
+        :param event: FINGERDOWN, FINGERMOTION or FINGERUP event
+        :param button_index: index of the button at the position of the event or None
+        """
+        arrangement = self.current_button_arrangement
+        pointer = (event.touch_id, event.finger_id)
+
+        if event.type == pygame.FINGERDOWN:
+            arrangement.set_pointer_pressed(pointer, button_index)
+            arrangement.set_pointer_hovered(pointer, button_index)
+
+        elif event.type == pygame.FINGERMOTION:
+            arrangement.set_pointer_hovered(pointer, button_index)
 
-                    # set new current_arrangement:
-                    arrangement_pointer = (self.current_button_arrangement.
-                                           get_arrangement_pointer_at_index(index_of_button_to_call))
+        else:
+            pressed_index = arrangement.pointer_up(pointer, button_index,
+                                                   set_selected=self.selected_mode,
+                                                   always_set_selected=self.process_not_longer_touched_buttons)
+            if pressed_index is not None and (button_index is not None or self.process_not_longer_touched_buttons):
+                self._process_released_button(pressed_index)
 
-                    if arrangement_pointer is None:
-                        continue
+    def _process_released_button(self, index: int) -> bool:
+        """
+        call the commands of a released button and switch to the arrangement it points to
+        :param index: index of the button inside the current arrangement
+        :return: True if the current arrangement has been switched
+        """
+        self._call_commands(self.current_button_arrangement, index)
 
-                    self.set_current_arrangement(arrangement_pointer)
-                    self.current_button_arrangement.set_hovered(self.get_index_at_position(position_on_surface))
+        arrangement_pointer = self.current_button_arrangement.get_arrangement_pointer_at_index(index)
+        if arrangement_pointer is None:
+            return False
 
-                    self.reload_surface = True
+        self.set_current_arrangement(arrangement_pointer)
+        return True
 
-        self.updated_buttons = self.current_button_arrangement.terminate_surface()
+    def _get_hit_test_key(self) -> tuple:
+        """
+        get the state of the current arrangement the results of hit tests depend on
+        """
+        arrangement = self.current_button_arrangement
+        return id(arrangement), getattr(arrangement, "scroll_position", None)
+
+    def _hit_test_events(self, events: list[pygame.Event, ...] | tuple[pygame.Event, ...],
+                         position: tuple, first_event: int) -> tuple[tuple, int, np.ndarray]:
+        """
+        hit test the positions of events at once
+        :param events: events of the frame
+        :param position: position of the ButtonBox on the display
+        :param first_event: number of the first event to be hit tested
+        :return: hit test key the indices are valid for, first_event and the indices (-1 for no button or no position)
+        """
+        event_positions = [event.pos if hasattr(event, "pos") else
+                           get_finger_position(event) if self.multi_touch and event.type in FINGER_EVENT_TYPES else
+                           None for event in events[first_event:]]
+        positions = np.array([event_position if event_position is not None else (0, 0)
+                              for event_position in event_positions],
+                             dtype=np.int64).reshape(-1, 2) - np.array(position[:2], dtype=np.int64)
+        # events without position are hit tested left of the ButtonBox, where no button can be hit:
+        positions[[event_position is None for event_position in event_positions]] = -1
+        return self._get_hit_test_key(), first_event, self.get_indices_at_positions(positions)
+
+    def _prerender_pointer_target(self):
+        """
+        draw the arrangement the pressed or else the hovered button points to within the predictive time budget
+        """
+        arrangement = self.current_button_arrangement
+        index = arrangement.pressed_index if arrangement.pressed_index is not None else arrangement.hovered_index
+        if index is None:
+            return None
+
+        pointer = arrangement.get_arrangement_pointer_at_index(index)
+        if pointer is None or self.button_arrangements[pointer] is arrangement:
+            return None
+
+        if self.direct_rendering:
+            self.button_arrangements[pointer].warm_surfaces(self.predictive_time_budget)
+        else:
+            self.button_arrangements[pointer].terminate_surface(self.predictive_time_budget)
+
+    def _call_commands(self, arrangement: ButtonArrangement, index: int):
+        """
+        call the commands of a button directly or submit them to the command executor used for the button
+        :param arrangement: arrangement containing the button
+        :param index: index of the button inside the arrangement
+        """
+        button = arrangement.buttons[index]
+        executor = button.command_executor if button.command_executor is not None else self.command_executor
+        if executor is None:
+            button.call_commands()
+            return None
+
+        passive_while_running = button.passive_while_running if button.passive_while_running is not None \
+            else self.passive_while_running
+        set_passive = passive_while_running and not arrangement.passive_button[index]
+        if set_passive:
+            arrangement.set_passive(index)
+
+        def on_done(future: concurrent.futures.Future):
+            if set_passive:
+                arrangement.set_active(index)
+            if button.on_commands_done is not None:
+                button.on_commands_done(future)
+            elif not future.cancelled() and future.exception() is not None:
+                raise future.exception()
+
+        executor.submit(button, on_done)
+        self._used_executors.add(executor)
+
+    def enable_statistics(self,
+                          history_size: int = 600,
+                          callback: typing.Callable[[FrameStatistics], typing.Any] = None) -> BoxStatistics:
+        """
+        start collecting per frame statistics, a frame ends with every call of blit_if_necessary
+        :param history_size: number of frames kept in the statistics history ring buffer
+        :param callback: called with the FrameStatistics of every finished frame
+        :return: the BoxStatistics object collecting the statistics (also available as statistics attribute)
+        """
+        self.statistics = BoxStatistics(self._get_surface_caches, history_size, callback)
+        return self.statistics
+
+    def _get_surface_caches(self) -> set[SurfaceCache]:
+        """
+        get the caches the surfaces of the buttons of all arrangements are looked up in
+        """
+        if self.surface_cache is not None:
+            return {self.surface_cache}
+        return {button.surface_cache for arrangement in self.button_arrangements.values()
+                for button in arrangement.buttons}
 
-    def blit_if_necessary(self, surface: pygame.Surface, position: tuple[int, int], force_blit: bool = False):
+    def disable_statistics(self):
+        """
+        stop collecting statistics
+        """
+        self.statistics = None
+
+    def blit_if_necessary(self,
+                          surface: pygame.Surface,
+                          position: tuple[int, int],
+                          force_blit: bool = False) -> list[pygame.Rect]:
         """
         method to blit the ButtonBox at a given position and a given surface in an efficient way
         :param surface: surface to blit on
         :param position: position on the surface to blit at
         :param force_blit: if True the ButtonBox is blitted completely even if it is not necessary (to be used if the
                            ButtonBoxes position has changed)
+        :return: list of rects on the given surface that were changed (can be handed to pygame.display.update)
+        """
+        statistics = self.statistics
+        if statistics is None:
+            return self._blit(surface, position, force_blit)
+
+        full_reload = self.reload_surface or force_blit
+        start = time.perf_counter()
+        dirty_rects = self._blit(surface, position, force_blit)
+        statistics.finish_frame(time.perf_counter() - start, full_reload, len(dirty_rects))
+        return dirty_rects
+
+    def _blit(self, surface: pygame.Surface, position: tuple[int, int], force_blit: bool) -> list[pygame.Rect]:
+        """
+        blit the ButtonBox (see blit_if_necessary)
+        :param surface: surface to blit on
+        :param position: position on the surface to blit at
+        :param force_blit: if True the ButtonBox is blitted completely
+        :return: list of changed rects on the given surface
         """
         if force_blit:
             self.reload_surface = True
 
+        if self.direct_rendering:
+            return self._blit_direct(surface, position)
+
+        dirty_rects = []
+        arrangement = self.current_button_arrangement
+
+        if not self.reload_surface and arrangement is not self._displayed_arrangement:
+            if self._displayed_arrangement.surface_moved:
+                # the displayed content is unknown, as the previous arrangement was moved without being blitted:
+                self._displayed_arrangement.surface_moved = False
+                self.reload_surface = True
+            else:
+                arrangement.terminate_surface()
+                dirty_rects.extend(self._blit_arrangement_difference(surface, position))
+                self.updated_buttons = False
+
         if self.reload_surface:
             self.updated_buttons = True
+            dirty_rects.append(pygame.Rect(position, self.size))
 
-            if self.button_layout_size[0] != self.arrangement_shape[0]:
+            if self.button_layout_size[0] != arrangement.visible_shape[0]:
                 pygame.draw.rect(surface,
                                  self.background_colour,
                                  (position[0] + self.current_button_arrangement.surface.get_width(),
@@ -603,7 +2537,7 @@ class ButtonBox:
                                   self.size[1])
                                  )
 
-            if self.button_layout_size[1] != self.arrangement_shape[1]:
+            if self.button_layout_size[1] != arrangement.visible_shape[1]:
                 pygame.draw.rect(surface,
                                  self.background_colour,
                                  (position[0],
@@ -613,10 +2547,166 @@ class ButtonBox:
                                  )
 
         if self.updated_buttons:
-            surface.blit(self.current_button_arrangement.surface, position)
+            if self.partial_blit and not self.reload_surface and not arrangement.surface_moved:
+                for index in arrangement.updated_indices:
+                    area = arrangement.get_rect_at_index(index)
+                    dirty_rects.append(surface.blit(arrangement.surface, area.move(position), area))
+            else:
+                changed_rect = surface.blit(arrangement.surface, position)
+                if not self.reload_surface:
+                    dirty_rects.append(changed_rect)
+
+        arrangement.updated_indices.clear()
+        arrangement.surface_moved = False
+        if (self.release_hidden_arrangements and self._displayed_arrangement is not None and
+                self._displayed_arrangement is not arrangement):
+            self._displayed_arrangement.release_surface()
+        self._displayed_arrangement = arrangement
+        self.updated_buttons = False
+        self.reload_surface = False
+        return dirty_rects
+
+    def _blit_direct(self, surface: pygame.Surface, position: tuple[int, int]) -> list[pygame.Rect]:
+        """
+        draw the changed buttons straight onto the surface (see direct_rendering argument)
+        :param surface: surface to draw on
+        :param position: position of the ButtonBox on the surface
+        :return: list of changed rects on the surface
+        """
+        arrangement = self.current_button_arrangement
+        box_rect = pygame.Rect(position, self.size)
+        reload_surface = self.reload_surface or arrangement.surface_moved
 
+        statistics = self.statistics
+        if statistics is not None:
+            cache_hits, cache_misses = statistics.get_cache_lookups()
+            redrawn_cells = arrangement.redrawn_cells
+
+        dirty_rects = []
+        if reload_surface:
+            surface.fill(self.background_colour, box_rect)
+            dirty_rects.append(box_rect)
+            arrangement.reset_displayed_states()
+        elif arrangement is not self._displayed_arrangement:
+            dirty_rects.extend(self._adopt_displayed_cells(surface, position))
+        arrangement.surface_moved = False
+
+        # buttons bigger than their cells must not be drawn outside the ButtonBox:
+        clip = surface.get_clip()
+        surface.set_clip(box_rect.clip(clip))
+        if statistics is None:
+            arrangement.terminate_surface(target=surface, offset=position)
+        else:
+            terminate_start = time.perf_counter()
+            arrangement.terminate_surface(target=surface, offset=position)
+            terminate_end = time.perf_counter()
+            hits, misses = statistics.get_cache_lookups()
+            statistics.add_terminate(terminate_end - terminate_start,
+                                     arrangement.redrawn_cells - redrawn_cells,
+                                     hits - cache_hits,
+                                     misses - cache_misses)
+        surface.set_clip(clip)
+
+        if not reload_surface:
+            dirty_rects.extend(arrangement.get_rect_at_index(index).move(position)
+                               for index in arrangement.updated_indices)
+        arrangement.updated_indices.clear()
+
+        self._displayed_arrangement = arrangement
         self.updated_buttons = False
         self.reload_surface = False
+        return dirty_rects
+
+    def _adopt_displayed_cells(self, surface: pygame.Surface, position: tuple[int, int]) -> list[pygame.Rect]:
+        """
+        take over the cells of the previously drawn arrangement that look the same in the current arrangement, mark the
+        others to be redrawn and clear the cells the current arrangement has no button in
+        :param surface: surface the ButtonBox is drawn on
+        :param position: position of the ButtonBox on the surface
+        :return: list of cleared rects on the surface
+        """
+        displayed = self._displayed_arrangement
+        arrangement = self.current_button_arrangement
+        box_rect = pygame.Rect((0, 0), self.size)
+        cell_offset = self.border_padding_size - math.ceil(self.button_padding_size / 2)
+
+        dirty_rects = []
+        for row in range(self.button_layout_size[1]):
+            for column in range(self.button_layout_size[0]):
+                displayed_content = self._get_cell_content(displayed, column, row)
+                index = arrangement.get_index_at_cell(column, row) if (
+                        column < arrangement.visible_shape[0] and row < arrangement.visible_shape[1]) else None
+
+                if index is not None:
+                    state = arrangement.get_button_state(index)
+                    if displayed_content == (arrangement.buttons[index], state, arrangement.button_size):
+                        arrangement.displayed_states[index] = state
+                    else:
+                        arrangement.displayed_states[index] = NO_STATE
+                        arrangement.mark_dirty(index)
+
+                elif displayed_content is not None:
+                    cell_rect = pygame.Rect(cell_offset + self.combined_button_size * column,
+                                            cell_offset + self.combined_button_size * row,
+                                            self.combined_button_size,
+                                            self.combined_button_size).clip(box_rect).move(position)
+                    surface.fill(self.background_colour, cell_rect)
+                    dirty_rects.append(cell_rect)
+        return dirty_rects
+
+    @staticmethod
+    def _get_cell_content(arrangement: ButtonArrangement, column: int, row: int) -> tuple | None:
+        """
+        get what is displayed by an arrangement in a cell of the layout
+        :param arrangement: arrangement to be checked
+        :param column: column of the cell
+        :param row: row of the cell
+        :return: button, displayed state and size or None if the cell only shows background
+        """
+        if column >= arrangement.visible_shape[0] or row >= arrangement.visible_shape[1]:
+            return None
+        index = arrangement.get_index_at_cell(column, row)
+        if index is None:
+            return None
+        return arrangement.buttons[index], arrangement.displayed_states[index], arrangement.button_size
+
+    def _blit_arrangement_difference(self, surface: pygame.Surface, position: tuple[int, int]) -> list[pygame.Rect]:
+        """
+        blit the cells of the current arrangement that differ from the previously blitted arrangement
+        :param surface: surface to blit on
+        :param position: position on the surface to blit at
+        :return: list of changed rects on the surface
+        """
+        displayed = self._displayed_arrangement
+        arrangement = self.current_button_arrangement
+
+        # cells that were redrawn on the displayed arrangement but never blitted have to be redrawn as well:
+        outdated_cells = {displayed.get_cell_at_index(index) for index in displayed.updated_indices}
+        displayed.updated_indices.clear()
+
+        box_rect = pygame.Rect((0, 0), self.size)
+        arrangement_rect = arrangement.surface.get_rect()
+        cell_offset = self.border_padding_size - math.ceil(self.button_padding_size / 2)
+
+        dirty_rects = []
+        for row in range(self.button_layout_size[1]):
+            for column in range(self.button_layout_size[0]):
+                if ((column, row) not in outdated_cells and
+                        self._get_cell_content(displayed, column, row) ==
+                        self._get_cell_content(arrangement, column, row)):
+                    continue
+
+                cell_rect = pygame.Rect(cell_offset + self.combined_button_size * column,
+                                        cell_offset + self.combined_button_size * row,
+                                        self.combined_button_size,
+                                        self.combined_button_size).clip(box_rect)
+                area = cell_rect.clip(arrangement_rect)
+                if area != cell_rect:
+                    surface.fill(self.background_colour, cell_rect.move(position))
+                if area.width and area.height:
+                    surface.blit(arrangement.surface, area.move(position), area)
+                dirty_rects.append(cell_rect.move(position))
+        return dirty_rects
 
 
 class EmbeddedButtonBox(ButtonBox):
@@ -649,7 +2739,16 @@ class EmbeddedButtonBox(ButtonBox):
                  additional_bottom_padding: int = -1,
                  additional_left_padding: int = -1,
                  additional_right_padding: int = -1,
-                 top_offset: int = 0
+                 top_offset: int = 0,
+                 partial_blit: bool = False,
+                 coalesce_motion_events: bool = False,
+                 surface_cache: SurfaceCache = None,
+                 release_hidden_arrangements: bool = False,
+                 command_executor: CommandExecutor = None,
+                 passive_while_running: bool = False,
+                 predictive_time_budget: float | None = None,
+                 direct_rendering: bool = False,
+                 multi_touch: bool = False
                  ):
         """
         child class of ButtonBox, adding an outline and optional title to the blitted ButtonBox
@@ -695,6 +2794,19 @@ class EmbeddedButtonBox(ButtonBox):
         :param additional_left_padding: specify additional_padding in left direction (see additional_padding)
         :param additional_right_padding: specify additional_padding in right direction (see additional_padding)
         :param top_offset: vertical offset to be added to the draw location specified in the blit_if_necessary method
+        :param partial_blit: blit only redrawn buttons and return their rects (handed to parent ButtonBox)
+        :param coalesce_motion_events: process only the last of consecutive MOUSEMOTION events
+                                       (handed to parent ButtonBox)
+        :param surface_cache: cache for the surfaces of all buttons in this box (handed to parent ButtonBox)
+        :param release_hidden_arrangements: release the surfaces of arrangements that are not displayed
+                                            (handed to parent ButtonBox)
+        :param command_executor: executor to run the commands of the buttons (handed to parent ButtonBox)
+        :param passive_while_running: set buttons passive while their commands are running (handed to parent ButtonBox)
+        :param predictive_time_budget: time per frame to draw the arrangement a hovered or pressed button points to
+                                       (handed to parent ButtonBox)
+        :param direct_rendering: draw changed buttons straight onto the target surface without an arrangement surface
+                                 (handed to parent ButtonBox)
+        :param multi_touch: handle touch events with independent state per touch (handed to parent ButtonBox)
         """
         super().__init__(button_layout_size=button_layout_size,
                          button_size=button_size,
@@ -702,7 +2814,16 @@ class EmbeddedButtonBox(ButtonBox):
                          border_padding_size=border_padding_size,
                          selected_mode=selected_mode,
                          background_colour=background_colour,
-                         process_not_longer_touched_buttons=process_not_longer_touched_buttons)
+                         process_not_longer_touched_buttons=process_not_longer_touched_buttons,
+                         partial_blit=partial_blit,
+                         coalesce_motion_events=coalesce_motion_events,
+                         surface_cache=surface_cache,
+                         release_hidden_arrangements=release_hidden_arrangements,
+                         command_executor=command_executor,
+                         passive_while_running=passive_while_running,
+                         predictive_time_budget=predictive_time_budget,
+                         direct_rendering=direct_rendering,
+                         multi_touch=multi_touch)
 
         # initialise outline parameters:
         self.outline_width = outline_width
@@ -718,6 +2839,11 @@ class EmbeddedButtonBox(ButtonBox):
         self.right_padding = additional_right_padding if additional_right_padding != -1 else additional_padding_size
         self.top_offset = top_offset
 
+        # outline and padding values at scale 1 (see set_scale):
+        self._base_chrome_sizes = (self.outline_width, self.additional_padding_size, self.outline_corner_radius,
+                                   self.top_padding, self.down_padding, self.left_padding, self.right_padding,
+                                   self.top_offset)
+
         # initialise heading if heading is specified:
         if heading_surface is not None or heading_text is not None:
             # store initial values:
@@ -733,14 +2859,20 @@ class EmbeddedButtonBox(ButtonBox):
             self._heading_bold_font = bold_font
             self._heading_italic_font = italic_font
 
+            # heading values at scale 1 (see set_scale), fonts that are no sys fonts keep their size:
+            self._heading_font_name = heading_font if not isinstance(heading_font, pygame.Font) else None
+            self._base_heading_sizes = (font_size, heading_padding, vertical_heading_offset,
+                                        additional_horizontal_heading_offset, horizontal_heading_position)
+            self._base_heading_surface = heading_surface
+
             # define needed values to later get heading position and surface:
             self.horizontal_heading_position = horizontal_heading_position if horizontal_heading_position is not None \
                 else max((self.outline_corner_radius, self.outline_width)) + self._additional_heading_offset
             self.heading_font = heading_font if isinstance(heading_font, pygame.Font) \
-                else pygame.font.SysFont(heading_font,
-                                         self._heading_font_size,
-                                         self._heading_bold_font,
-                                         self._heading_italic_font)
+                else get_sys_font(heading_font,
+                                  self._heading_font_size,
+                                  self._heading_bold_font,
+                                  self._heading_italic_font)
 
             # define heading surface and position:
             self.heading = self._get_heading()
@@ -749,20 +2881,83 @@ class EmbeddedButtonBox(ButtonBox):
         else:
             self.heading = None
 
+        # pre-rendered outline, additional padding and heading, regenerated if one of their parameters changes:
+        self._chrome_key = None
+        self._chrome_blits: list[tuple[pygame.Surface, tuple[int, int]]] = []
+        self._chrome_rect = pygame.Rect(0, 0, 0, 0)
+
+    def set_scale(self, scale: float, time_budget: float | None = 0.004):
+        """
+        scale button size, paddings, outline and heading relative to the values the EmbeddedButtonBox was created with
+        (see ButtonBox.set_scale)
+        :param scale: new scale, 1 means the initial size
+        :param time_budget: (see ButtonBox.set_button_size)
+        """
+        super().set_scale(scale, time_budget)
+
+        (self.outline_width, self.additional_padding_size, outline_corner_radius, self.top_padding, self.down_padding,
+         self.left_padding, self.right_padding, self.top_offset) = (round(size * scale)
+                                                                    for size in self._base_chrome_sizes)
+        self.outline_corner_radius = outline_corner_radius if self._base_chrome_sizes[2] != -1 else -1
+        self.internal_rect_corner_radius = self._get_internal_corner_radius()
+
+        if self.heading is None:
+            return None
+
+        font_size, heading_padding, vertical_offset, additional_offset, horizontal_position = self._base_heading_sizes
+        self._heading_padding = round(heading_padding * scale)
+        self._heading_vertical_offset = round(vertical_offset * scale)
+        self._additional_heading_offset = round(additional_offset * scale)
+        self.horizontal_heading_position = round(horizontal_position * scale) if horizontal_position is not None \
+            else max((self.outline_corner_radius, self.outline_width)) + self._additional_heading_offset
+
+        if self._heading_font_name is not None:
+            self._heading_font_size = max(1, round(font_size * scale))
+            self.heading_font = get_sys_font(self._heading_font_name,
+                                             self._heading_font_size,
+                                             self._heading_bold_font,
+                                             self._heading_italic_font)
+        if self._base_heading_surface is not None:
+            self._heading_surface = self._base_heading_surface if scale == 1 \
+                else pygame.transform.smoothscale_by(self._base_heading_surface, scale)
+
+        self.heading = self._get_heading()
+        self.heading_position = self._get_heading_position()
+
     def _get_heading(self) -> pygame.Surface:
         """
-        get surface to be used as heading, requires initialised heading parameters
+        get surface to be used as heading, requires initialised heading parameters, headings rendered from text are
+        shared between all EmbeddedButtonBoxes with the same text and style
         :return: heading surface
         """
         if self._heading_surface is not None:
-            text_render = self._heading_surface
-
-        else:
-            text_render = self.heading_font.render(self._heading_text,
-                                                   self._heading_antialias,
-                                                   self._heading_colour,
-                                                   self._heading_background_colour)
-
+            return self._render_heading(self._heading_surface)
+
+        key = (self.heading_font,
+               self._heading_text,
+               self._heading_antialias,
+               tuple(self._heading_colour),
+               tuple(self._heading_background_colour) if self._heading_background_colour is not None else None,
+               self._heading_padding,
+               self._heading_vertical_offset,
+               self.outline_width,
+               tuple(self.background_colour))
+
+        heading = heading_surface_cache.get(key)
+        if heading is None:
+            heading = heading_surface_cache.add(key, self._render_heading(
+                self.heading_font.render(self._heading_text,
+                                         self._heading_antialias,
+                                         self._heading_colour,
+                                         self._heading_background_colour)))
+        return heading
+
+    def _render_heading(self, text_render: pygame.Surface) -> pygame.Surface:
+        """
+        add padding and background to the rendered heading text
+        :param text_render: rendered heading text or heading surface
+        :return: heading surface
+        """
         if (text_render.get_height() >= self.outline_width and
                 self._heading_padding == 0 and
                 self._heading_background_colour is not None):
@@ -881,31 +3076,93 @@ class EmbeddedButtonBox(ButtonBox):
                      tuple(heading_pos + pos for heading_pos, pos in zip(self.heading_position, position))
                      )
 
-    def blit_if_necessary(self, surface: pygame.Surface, position: tuple[int, int], force_blit: bool = False):
+    def _blit(self, surface: pygame.Surface, position: tuple[int, int], force_blit: bool) -> list[pygame.Rect]:
         """
         overwrites ButtonBoxes method by adding additional padding, heading and outline
         :param surface: surface to blit on
         :param position: position on the surface to blit at
-        :param force_blit: if True the ButtonBox is blitted completely even if it is not necessary (to be used if the
-                           ButtonBoxes position has changed)
+        :param force_blit: if True the ButtonBox is blitted completely
+        :return: list of changed rects on the given surface
         """
         if force_blit:
             self.reload_surface = True
 
         reload_surface = self.reload_surface
 
-        super().blit_if_necessary(surface, self._get_position_with_outline_width(position))
+        dirty_rects = super()._blit(surface, self._get_position_with_outline_width(position), False)
 
         if reload_surface:
-            parent_size = super().get_size()
+            self._update_chrome()
+            surface.fblits([(piece, (position[0] + offset[0], position[1] + offset[1]))
+                            for piece, offset in self._chrome_blits])
+            return [self._chrome_rect.move(position)]
 
-            if self.additional_padding_size != 0:
-                self._draw_additional_padding(surface, position, parent_size)
+        return dirty_rects
 
-            self._draw_outline(surface, position, parent_size)
+    def _get_chrome_key(self) -> tuple:
+        """
+        get all parameters the appearance of outline, additional padding and heading depends on
+        :return: tuple of parameters
+        """
+        return (super().get_size(),
+                self.outline_width,
+                self.additional_padding_size,
+                tuple(self.outline_colour),
+                tuple(self.background_colour),
+                self.outline_corner_radius,
+                self.internal_rect_corner_radius,
+                self.top_padding,
+                self.down_padding,
+                self.left_padding,
+                self.right_padding,
+                self.top_offset,
+                self.heading,
+                self._get_heading_position() if self.heading is not None else None)
+
+    def _update_chrome(self):
+        """
+        render outline, additional padding and heading onto a transparent surface if their parameters have changed and
+        split it into the pieces around the internal ButtonBox, so that they can be blitted in one operation
+        """
+        chrome_key = self._get_chrome_key()
+        if chrome_key == self._chrome_key:
+            return None
+        self._chrome_key = chrome_key
+
+        chrome_rect = pygame.Rect((0, 0), self.get_size())
+        if self.heading is not None:
+            chrome_rect.union_ip(pygame.Rect(self.heading_position, self.heading.get_size()))
+
+        chrome_surface = pygame.Surface(chrome_rect.size).convert_alpha()
+        chrome_surface.fill((0, 0, 0, 0))
+        origin = (-chrome_rect.x, -chrome_rect.y)
+        parent_size = super().get_size()
 
-            if self.heading is not None:
-                self._draw_heading(surface, position)
+        if self.additional_padding_size != 0:
+            self._draw_additional_padding(chrome_surface, origin, parent_size)
+
+        self._draw_outline(chrome_surface, origin, parent_size)
+
+        if self.heading is not None:
+            self._draw_heading(chrome_surface, origin)
+
+        # only the area around the internal ButtonBox is blitted, as the ButtonBox covers the area inside:
+        inner_rect = pygame.Rect(self._get_position_with_outline_width(origin), parent_size)
+        width, height = chrome_rect.size
+        pieces = [pygame.Rect(0, 0, width, inner_rect.top),
+                  pygame.Rect(0, inner_rect.bottom, width, height - inner_rect.bottom),
+                  pygame.Rect(0, inner_rect.top, inner_rect.left, inner_rect.height),
+                  pygame.Rect(inner_rect.right, inner_rect.top, width - inner_rect.right, inner_rect.height)]
+
+        # a heading reaching into the ButtonBox is drawn on top of it:
+        if self.heading is not None:
+            pieces.append(pygame.Rect(self.heading_position[0] + origin[0],
+                                      self.heading_position[1] + origin[1],
+                                      *self.heading.get_size()).clip(inner_rect))
+
+        self._chrome_blits = [(chrome_surface.subsurface(piece), (piece.x + chrome_rect.x, piece.y + chrome_rect.y))
+                              for piece in pieces if piece.width > 0 and piece.height > 0]
+        self._chrome_rect = chrome_rect
 
     def blit_on_surface(self, surface: pygame.Surface, position: tuple[int, int]):
         """
@@ -916,6 +3173,195 @@ class EmbeddedButtonBox(ButtonBox):
         self.blit_if_necessary(surface, position, True)
 
 
+class ButtonBoxManager:
+    def __init__(self, grid_cell_size: int = 128):
+        """
+        container for many ButtonBoxes at fixed positions, routing every mouse event only to the boxes it concerns by
+        looking them up in a grid based spatial index
+        :param grid_cell_size: edge length of the cells of the spatial index, should be about the size of a small box
+        """
+        self.grid_cell_size = grid_cell_size
+
+        self.boxes: dict[str, ButtonBox] = {}
+        self.positions: dict[str, tuple[int, int]] = {}
+        self._rects: dict[str, pygame.Rect] = {}
+        self._grid: dict[tuple[int, int], list[str]] = {}
+        self._layers: dict[str, int] = {}
+        self._next_layer = 0
+
+        self._hovered_name = None
+        self._pressed_name = None
+        # names of the boxes every touch is above and has gone down on:
+        self._finger_hovered_names: dict[tuple[int, int], str | None] = {}
+        self._finger_pressed_names: dict[tuple[int, int], str | None] = {}
+        self.scale = 1
+
+    def add_box(self, name: str, box: ButtonBox, position: tuple[int, int]):
+        """
+        add a ButtonBox, boxes added later are considered to be on top of the ones added before
+        :param name: name to refer to the box (used as dict key)
+        :param box: ButtonBox or EmbeddedButtonBox to be managed
+        :param position: position of the box on the surface it is blitted on
+        """
+        if name in self.boxes:
+            self.remove_box(name)
+        self.boxes[name] = box
+        self.positions[name] = tuple(position)
+        self._layers[name] = self._next_layer
+        self._next_layer += 1
+        self._insert_into_grid(name)
+
+    def remove_box(self, name: str) -> ButtonBox:
+        """
+        remove a managed ButtonBox
+        :param name: name of the box
+        :return: the removed box
+        """
+        self._remove_from_grid(name)
+        del self.positions[name]
+        del self._layers[name]
+        if self._hovered_name == name:
+            self._hovered_name = None
+        if self._pressed_name == name:
+            self._pressed_name = None
+        for finger_names in (self._finger_hovered_names, self._finger_pressed_names):
+            for finger, finger_name in finger_names.items():
+                if finger_name == name:
+                    finger_names[finger] = None
+        return self.boxes.pop(name)
+
+    def set_position(self, name: str, position: tuple[int, int]):
+        """
+        move a managed ButtonBox, it is blitted completely on the next call of blit_if_necessary
+        :param name: name of the box
+        :param position: new position of the box
+        """
+        self._remove_from_grid(name)
+        self.positions[name] = tuple(position)
+        self._insert_into_grid(name)
+        self.boxes[name].reload_surface = True
+
+    def set_scale(self, scale: float, time_budget: float | None = 0.004):
+        """
+        scale all managed boxes (see ButtonBox.set_scale) and their positions
+        :param scale: new scale, 1 means the initial size and positions
+        :param time_budget: (see ButtonBox.set_button_size)
+        """
+        for name, box in self.boxes.items():
+            box.set_scale(scale, time_budget)
+            self.positions[name] = tuple(round(axis * scale / self.scale) for axis in self.positions[name])
+        self.scale = scale
+        self.update_index()
+
+    def update_index(self):
+        """
+        rebuild the spatial index, needed if the size of a managed box has changed
+        """
+        self._grid.clear()
+        self._rects.clear()
+        for name in self.boxes:
+            self._insert_into_grid(name)
+
+    def _get_grid_cells(self, rect: pygame.Rect) -> typing.Iterator[tuple[int, int]]:
+        for x in range(rect.left // self.grid_cell_size, (rect.right - 1) // self.grid_cell_size + 1):
+            for y in range(rect.top // self.grid_cell_size, (rect.bottom - 1) // self.grid_cell_size + 1):
+                yield x, y
+
+    def _insert_into_grid(self, name: str):
+        rect = pygame.Rect(self.positions[name], self.boxes[name].get_size())
+        self._rects[name] = rect
+        for cell in self._get_grid_cells(rect):
+            self._grid.setdefault(cell, []).append(name)
+
+    def _remove_from_grid(self, name: str):
+        for cell in self._get_grid_cells(self._rects.pop(name)):
+            self._grid[cell].remove(name)
+            if not self._grid[cell]:
+                del self._grid[cell]
+
+    def get_box_name_at_position(self, position: tuple[int, int]) -> str | None:
+        """
+        get the name of the top most box at a given position
+        :param position: position on the surface the boxes are blitted on
+        :return: name of the box or None if there is no box at the given position
+        """
+        candidates = self._grid.get((position[0] // self.grid_cell_size, position[1] // self.grid_cell_size))
+        if candidates is None:
+            return None
+
+        top_name = None
+        for name in candidates:
+            if self._rects[name].collidepoint(position) and \
+                    (top_name is None or self._layers[name] > self._layers[top_name]):
+                top_name = name
+        return top_name
+
+    def run_logic(self, events: list[pygame.Event, ...] | tuple[pygame.Event, ...]):
+        """
+        route the mouse and touch events to the boxes concerned and run their logic, a box receives the events at its
+        position, the events leaving it and all events while one of its buttons is pressed, each touch is routed on its
+        own
+        :param events: list or tuple of events to be handled
+        """
+        routed_events = {name: [] for name in self.boxes}
+
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                name = self.get_box_name_at_position(event.pos)
+                receivers = {name, self._hovered_name, self._pressed_name}
+                self._hovered_name = name
+
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                name = self.get_box_name_at_position(event.pos)
+                receivers = {name, self._pressed_name}
+                if event.button == 1:
+                    self._pressed_name = name
+
+            elif event.type == pygame.MOUSEBUTTONUP:
+                receivers = {self.get_box_name_at_position(event.pos), self._pressed_name}
+                if event.button == 1:
+                    self._pressed_name = None
+
+            elif event.type == pygame.MOUSEWHEEL:
+                receivers = {self._hovered_name}
+
+            elif event.type in FINGER_EVENT_TYPES:
+                finger = (event.touch_id, event.finger_id)
+                name = self.get_box_name_at_position(get_finger_position(event))
+                if event.type == pygame.FINGERDOWN:
+                    receivers = {name, self._finger_pressed_names.get(finger)}
+                    self._finger_pressed_names[finger] = name
+                    self._finger_hovered_names[finger] = name
+                elif event.type == pygame.FINGERMOTION:
+                    receivers = {name, self._finger_hovered_names.get(finger), self._finger_pressed_names.get(finger)}
+                    self._finger_hovered_names[finger] = name
+                else:
+                    receivers = {name, self._finger_hovered_names.pop(finger, None),
+                                 self._finger_pressed_names.pop(finger, None)}
+
+            else:
+                continue
+
+            for name in receivers:
+                if name is not None:
+                    routed_events[name].append(event)
+
+        for name, box in self.boxes.items():
+            box.run_logic(routed_events[name], self.positions[name])
+
+    def blit_if_necessary(self, surface: pygame.Surface, force_blit: bool = False) -> list[pygame.Rect]:
+        """
+        blit all managed boxes that have changed at their positions
+        :param surface: surface to blit on
+        :param force_blit: if True all boxes are blitted completely
+        :return: list of changed rects on the given surface (can be handed to pygame.display.update)
+        """
+        dirty_rects = []
+        for name, box in self.boxes.items():
+            dirty_rects.extend(box.blit_if_necessary(surface, self.positions[name], force_blit))
+        return dirty_rects
+
+
 if __name__ == "__main__":
     # test code:
     import matplotlib.pyplot as plt
@@ -923,6 +3369,8 @@ if __name__ == "__main__":
     pygame.init()
     window = pygame.display.set_mode((1000, 1000))
     window.fill((255, 255, 255))
+    # the background is shown once, afterwards only the dirty rects of the box are updated:
+    pygame.display.update()
 
     p_appearance = ButtonAppearance(1.2, alpha=150)
     h_appearance = ButtonAppearance(size_percentage=1,
@@ -959,7 +3407,8 @@ if __name__ == "__main__":
                                  font_size=25,
                                  heading_font="comic sans",
                                  vertical_heading_offset=-3,
-                                 process_not_longer_touched_buttons=True)
+                                 process_not_longer_touched_buttons=True,
+                                 partial_blit=True)
 
     test_box.add_button_arrangement("first",
                                     (3, 2),
@@ -985,11 +3434,11 @@ if __name__ == "__main__":
 
         start = time.perf_counter()
         test_box.run_logic(events, (100, 100))
-        test_box.blit_if_necessary(window, (100, 100))
+        dirty_rects = test_box.blit_if_necessary(window, (100, 100))
         end = time.perf_counter()
         timings.append((end - start) * 60)
 
         # window.blit(test_box.current_button_arrangement.surface, (300, 500))
 
-        pygame.display.update()
+        pygame.display.update(dirty_rects)
         clock.tick(60)
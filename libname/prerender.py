@@ -0,0 +1,241 @@
+"""
+offline pre-rendering of the button surfaces into an on-disk cache
+
+rendering every state surface of many buttons at application start is slow, the surfaces can instead be rendered once
+by a pool of processes and stored on disk:
+
+    prerender(buttons, (48, 64), "button_cache")
+
+later launches load the stored surfaces into the surface caches of the buttons, only surfaces that are missing (for
+example after a texture or appearance has changed) have to be rendered again:
+
+    load_prerendered(buttons, (48, 64), "button_cache")
+
+or from the command line: python prerender.py my_module:create_buttons button_cache --sizes 48 64
+"""
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import hashlib
+import importlib
+import multiprocessing
+import os
+import typing
+
+import numpy as np
+import pygame
+
+from buttons import ALL_STATES, BaseButton, ButtonAppearance, SurfaceCache
+
+# changing the file format or the rendering code invalidates all stored surfaces:
+CACHE_VERSION = 1
+
+
+def get_texture_digest(texture: pygame.Surface) -> str:
+    """
+    get a hash of the size and pixels of a texture, equal for equal textures across processes and launches
+    :param texture: texture to be hashed
+    :return: hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(texture.get_size()).encode())
+    digest.update(pygame.image.tobytes(texture, "RGBA"))
+    return digest.hexdigest()
+
+
+def get_entry_name(texture_digest: str, appearance: ButtonAppearance, size: int) -> str:
+    """
+    get the file name a rendered surface is stored with
+    :param texture_digest: digest of the texture (see get_texture_digest)
+    :param appearance: appearance applied to the texture
+    :param size: button size
+    :return: file name
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((CACHE_VERSION, pygame.version.ver, texture_digest, appearance, size)).encode())
+    return f"{digest.hexdigest()}.npy"
+
+
+class DiskSurfaceCache:
+    def __init__(self, directory: str):
+        """
+        directory of rendered surfaces, every surface is stored as raw rgba pixel array that is memory-mapped on loading
+        :param directory: directory of the cache, created if it does not exist
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get_path(self, texture_digest: str, appearance: ButtonAppearance, size: int) -> str:
+        return os.path.join(self.directory, get_entry_name(texture_digest, appearance, size))
+
+    def contains(self, texture_digest: str, appearance: ButtonAppearance, size: int) -> bool:
+        return os.path.exists(self.get_path(texture_digest, appearance, size))
+
+    def get(self, texture_digest: str, appearance: ButtonAppearance, size: int) -> pygame.Surface | None:
+        """
+        load a stored surface
+        :param texture_digest: digest of the texture (see get_texture_digest)
+        :param appearance: appearance applied to the texture
+        :param size: button size
+        :return: loaded surface or None if it is not stored
+        """
+        try:
+            pixels = np.load(self.get_path(texture_digest, appearance, size), mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+
+        # the pixel array has the shape (height, width, 4), the surface is copied out of the mapped file:
+        surface = pygame.image.frombuffer(pixels, (pixels.shape[1], pixels.shape[0]), "RGBA")
+        return surface.convert_alpha() if pygame.display.get_surface() is not None else surface.copy()
+
+    def add(self, texture_digest: str, appearance: ButtonAppearance, size: int, surface: pygame.Surface):
+        """
+        store a surface, the file is replaced atomically, so that concurrent writers and readers never see partial files
+        :param texture_digest: digest of the texture (see get_texture_digest)
+        :param appearance: appearance applied to the texture
+        :param size: button size
+        :param surface: rendered surface
+        """
+        width, height = surface.get_size()
+        pixels = np.frombuffer(pygame.image.tobytes(surface, "RGBA"), dtype=np.uint8).reshape((height, width, 4))
+
+        path = self.get_path(texture_digest, appearance, size)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            np.save(file, pixels)
+        os.replace(temporary_path, path)
+
+
+def _initialise_worker():
+    # rendering converts surfaces to the display format, so every worker needs a (hidden) display, the video driver
+    # of the calling application inherited with the environment must not open windows:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+
+def _render_entries(directory: str,
+                    texture_digest: str,
+                    texture_bytes: bytes,
+                    texture_size: tuple[int, int],
+                    entries: list[tuple[ButtonAppearance, int]]) -> int:
+    """
+    render all surfaces of a texture in a worker process and store them
+    :param directory: directory of the DiskSurfaceCache
+    :param texture_digest: digest of the texture
+    :param texture_bytes: rgba pixels of the texture, surfaces cannot be sent to other processes
+    :param texture_size: size of the texture
+    :param entries: appearances and sizes to be rendered
+    :return: number of rendered surfaces
+    """
+    disk_cache = DiskSurfaceCache(directory)
+    texture = pygame.image.frombytes(texture_bytes, texture_size, "RGBA").convert_alpha()
+    for appearance, size in entries:
+        disk_cache.add(texture_digest, appearance, size, appearance.get_appearance_applied_button(texture, size))
+    return len(entries)
+
+
+def _get_missing_entries(buttons: typing.Iterable[BaseButton],
+                         sizes: typing.Iterable[int],
+                         disk_cache: DiskSurfaceCache,
+                         states: tuple[int, ...]) -> dict[pygame.Surface, tuple[str, set]]:
+    """
+    get the texture digests and the appearances and sizes that are not stored yet, grouped by texture
+    """
+    texture_digests = {}
+    missing_entries = {}
+    for button in buttons:
+        if button.texture not in texture_digests:
+            texture_digests[button.texture] = get_texture_digest(button.texture)
+        texture_digest = texture_digests[button.texture]
+
+        for state in states:
+            appearance = button.get_appearance_by_state(state)
+            for size in sizes:
+                if not disk_cache.contains(texture_digest, appearance, size):
+                    missing_entries.setdefault(button.texture, (texture_digest, set()))[1].add((appearance, size))
+    return missing_entries
+
+
+def prerender(buttons: typing.Iterable[BaseButton],
+              sizes: typing.Iterable[int],
+              directory: str,
+              processes: int = None,
+              states: tuple[int, ...] = ALL_STATES) -> int:
+    """
+    render the surfaces of buttons that are not stored in the on-disk cache yet in a pool of processes
+    :param buttons: buttons to be rendered
+    :param sizes: button sizes to be rendered
+    :param directory: directory of the on-disk cache
+    :param processes: number of worker processes, None means the number of processors
+    :param states: states to be rendered
+    :return: number of rendered surfaces
+    """
+    disk_cache = DiskSurfaceCache(directory)
+    missing_entries = _get_missing_entries(buttons, tuple(sizes), disk_cache, states)
+    if not missing_entries:
+        return 0
+
+    # forked workers would share the display connection of the calling application, spawned ones start a clean SDL:
+    with concurrent.futures.ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=_initialise_worker) as executor:
+        futures = [executor.submit(_render_entries, directory, texture_digest,
+                                   pygame.image.tobytes(texture, "RGBA"), texture.get_size(), list(entries))
+                   for texture, (texture_digest, entries) in missing_entries.items()]
+        return sum(future.result() for future in futures)
+
+
+def load_prerendered(buttons: typing.Iterable[BaseButton],
+                     sizes: typing.Iterable[int],
+                     directory: str,
+                     surface_cache: SurfaceCache = None,
+                     states: tuple[int, ...] = ALL_STATES) -> int:
+    """
+    add the stored surfaces of buttons to surface caches, so that BaseButton.get_surface does not have to render them
+    :param buttons: buttons to be loaded
+    :param sizes: button sizes to be loaded
+    :param directory: directory of the on-disk cache
+    :param surface_cache: cache to be filled instead of the surface caches of the buttons
+    :param states: states to be loaded
+    :return: number of loaded surfaces
+    """
+    disk_cache = DiskSurfaceCache(directory)
+    sizes = tuple(sizes)
+    texture_digests = {}
+    loaded = 0
+
+    for button in buttons:
+        cache = surface_cache if surface_cache is not None else button.surface_cache
+        if button.texture not in texture_digests:
+            texture_digests[button.texture] = get_texture_digest(button.texture)
+
+        for state in states:
+            appearance = button.get_appearance_by_state(state)
+            for size in sizes:
+                key = (button.texture, appearance, size)
+                if key in cache:
+                    continue
+                surface = disk_cache.get(texture_digests[button.texture], appearance, size)
+                if surface is not None:
+                    cache.add(key, surface)
+                    loaded += 1
+    return loaded
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    parser = argparse.ArgumentParser(description="render the button surfaces into an on-disk cache")
+    parser.add_argument("buttons_factory",
+                        help="function returning the buttons as module:function, called without arguments")
+    parser.add_argument("directory", help="directory of the on-disk cache")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[48], help="button sizes to be rendered")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes")
+    arguments = parser.parse_args()
+
+    _initialise_worker()
+    module_name, function_name = arguments.buttons_factory.split(":")
+    factory_buttons = getattr(importlib.import_module(module_name), function_name)()
+
+    print(f"rendered {prerender(factory_buttons, arguments.sizes, arguments.directory, arguments.processes)} surfaces")
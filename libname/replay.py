@@ -0,0 +1,253 @@
+"""
+recording and headless replay of the input fed into ButtonBox.run_logic
+
+record the input of a running application by calling the run_logic method of an InputRecorder instead of the one of
+the box:
+
+    recorder = InputRecorder(box)
+    ...
+    recorder.run_logic(events, position)
+    ...
+    recorder.save("hitch.npz")
+
+the recording can later be replayed against a box with the same configuration, for example inside a regression test:
+
+    result = replay(load_recording("hitch.npz"), create_box(), window)
+    assert result.summary()["p99_ms"] < 16
+
+or from the command line: python replay.py hitch.npz my_module:create_box
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import time
+
+import numpy as np
+import pygame
+
+from buttons import FINGER_EVENT_TYPES, ButtonBox, get_finger_position
+from timings import summarise
+
+# event types that are recorded, all other events are ignored by ButtonBox.run_logic:
+RECORDED_EVENT_TYPES = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+                        *FINGER_EVENT_TYPES)
+
+FRAME_DTYPE = np.dtype([("time", np.float64), ("position", np.int32, 2), ("first_event", np.int64),
+                        ("event_count", np.int32)])
+# touch is set for mouse events emulated from touches, touch_id and finger_id identify the touch of touch events:
+EVENT_DTYPE = np.dtype([("type", np.int32), ("position", np.float64, 2), ("button", np.int32), ("touch", np.bool_),
+                        ("touch_id", np.int64), ("finger_id", np.int64)])
+
+
+def _encode_event(event: pygame.Event) -> tuple:
+    # wheel events have no position, their scroll amount is stored instead:
+    if event.type == pygame.MOUSEWHEEL:
+        return event.type, (event.x, event.y), 0, getattr(event, "touch", False), 0, 0
+    # touch positions are stored in pixels, so that they hit the same position in a replay window of another size:
+    if event.type in FINGER_EVENT_TYPES:
+        return event.type, get_finger_position(event), 0, True, event.touch_id, event.finger_id
+    return event.type, event.pos, getattr(event, "button", 0), getattr(event, "touch", False), 0, 0
+
+
+def _decode_event(encoded_event: np.void) -> pygame.Event:
+    event_type = int(encoded_event["type"])
+    position = tuple(int(axis) for axis in encoded_event["position"])
+    touch = bool(encoded_event["touch"])
+    if event_type == pygame.MOUSEWHEEL:
+        return pygame.event.Event(event_type, x=position[0], y=position[1], flipped=False, touch=touch)
+    if event_type in FINGER_EVENT_TYPES:
+        # normalised to the current window like the touch events of SDL:
+        width, height = pygame.display.get_window_size()
+        return pygame.event.Event(event_type, touch_id=int(encoded_event["touch_id"]),
+                                  finger_id=int(encoded_event["finger_id"]), x=(position[0] + 0.5) / width,
+                                  y=(position[1] + 0.5) / height, dx=0.0, dy=0.0,
+                                  pressure=0.0 if event_type == pygame.FINGERUP else 1.0)
+    if event_type == pygame.MOUSEMOTION:
+        return pygame.event.Event(event_type, pos=position, rel=(0, 0), buttons=(0, 0, 0), touch=touch)
+    return pygame.event.Event(event_type, pos=position, button=int(encoded_event["button"]), touch=touch)
+
+
+class Recording:
+    def __init__(self, frames: np.ndarray, events: np.ndarray, box_size: tuple[int, int]):
+        """
+        recorded input of a ButtonBox, one entry per call of run_logic
+        :param frames: structured array with FRAME_DTYPE
+        :param events: structured array with EVENT_DTYPE, referenced by the frames
+        :param box_size: size of the recorded box, used to check that a replay uses a matching box
+        """
+        self.frames = frames
+        self.events = events
+        self.box_size = tuple(box_size)
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def get_frame(self, index: int) -> tuple[float, tuple[int, int], list[pygame.Event]]:
+        """
+        get the recorded input of a frame
+        :param index: index of the frame
+        :return: time since the start of the recording, position argument and events of the frame
+        """
+        frame = self.frames[index]
+        first_event = int(frame["first_event"])
+        events = [_decode_event(encoded_event)
+                  for encoded_event in self.events[first_event:first_event + int(frame["event_count"])]]
+        return float(frame["time"]), (int(frame["position"][0]), int(frame["position"][1])), events
+
+    def save(self, path: str):
+        """
+        save the recording as compressed numpy archive
+        :param path: path of the file
+        """
+        with open(path, "wb") as file:
+            np.savez_compressed(file, frames=self.frames, events=self.events, box_size=np.array(self.box_size))
+
+
+def load_recording(path: str) -> Recording:
+    """
+    load a recording saved by Recording.save or InputRecorder.save
+    :param path: path of the file
+    :return: loaded recording
+    """
+    with np.load(path) as archive:
+        events = archive["events"]
+        if events.dtype != EVENT_DTYPE:
+            # recordings made before touch events were recorded lack the touch fields:
+            converted_events = np.zeros(len(events), dtype=EVENT_DTYPE)
+            for name in events.dtype.names:
+                converted_events[name] = events[name]
+            events = converted_events
+        return Recording(archive["frames"], events, tuple(archive["box_size"].tolist()))
+
+
+class InputRecorder:
+    def __init__(self, box: ButtonBox):
+        """
+        records the input of a ButtonBox while passing it on
+        :param box: ButtonBox or EmbeddedButtonBox to record the input of
+        """
+        self.box = box
+        self._start = time.perf_counter()
+        self._frames = []
+        self._events = []
+
+    def run_logic(self, events: list[pygame.Event, ...] | tuple[pygame.Event, ...], position: tuple):
+        """
+        record the arguments and call the run_logic method of the box with them
+        :param events: events to be handled
+        :param position: position of the box
+        """
+        recorded_events = [_encode_event(event) for event in events if event.type in RECORDED_EVENT_TYPES]
+        self._frames.append((time.perf_counter() - self._start, position, len(self._events), len(recorded_events)))
+        self._events.extend(recorded_events)
+        self.box.run_logic(events, position)
+
+    def get_recording(self) -> Recording:
+        """
+        get everything recorded so far
+        :return: recording
+        """
+        return Recording(np.array(self._frames, dtype=FRAME_DTYPE),
+                         np.array(self._events, dtype=EVENT_DTYPE),
+                         self.box.get_size())
+
+    def save(self, path: str):
+        """
+        save everything recorded so far (see Recording.save)
+        :param path: path of the file
+        """
+        self.get_recording().save(path)
+
+
+class ReplayResult:
+    def __init__(self, logic_times: np.ndarray, blit_times: np.ndarray, dirty_rects: np.ndarray,
+                 dirty_areas: np.ndarray):
+        """
+        measurements of a replay, one entry per frame
+        :param logic_times: duration of run_logic in seconds
+        :param blit_times: duration of blit_if_necessary in seconds
+        :param dirty_rects: number of rects returned by blit_if_necessary
+        :param dirty_areas: summed area of the rects returned by blit_if_necessary in pixels
+        """
+        self.logic_times = logic_times
+        self.blit_times = blit_times
+        self.dirty_rects = dirty_rects
+        self.dirty_areas = dirty_areas
+
+    @property
+    def frame_times(self) -> np.ndarray:
+        return self.logic_times + self.blit_times
+
+    def summary(self) -> dict:
+        """
+        summarise the replay
+        :return: dict with the frame time percentiles in milliseconds and the dirty region counts
+        """
+        summary = summarise("replay", self.frame_times)
+        summary.update(slowest_frame=int(np.argmax(self.frame_times)),
+                       dirty_rects=int(self.dirty_rects.sum()),
+                       dirty_area=int(self.dirty_areas.sum()),
+                       frames_with_updates=int(np.count_nonzero(self.dirty_rects)))
+        return summary
+
+
+def replay(recording: Recording, box: ButtonBox, surface: pygame.Surface, realtime: bool = False) -> ReplayResult:
+    """
+    feed recorded input into a box and measure every frame
+    :param recording: recording to replay
+    :param box: box configured like the recorded one
+    :param surface: surface the box is blitted on
+    :param realtime: if True the replay waits between the frames as long as the recording did
+    :return: measurements of all frames
+    """
+    if tuple(box.get_size()) != recording.box_size:
+        raise ValueError(f"box size {box.get_size()} does not match the recorded box size {recording.box_size}")
+
+    logic_times = np.zeros(len(recording))
+    blit_times = np.zeros(len(recording))
+    dirty_rects = np.zeros(len(recording), dtype=np.int64)
+    dirty_areas = np.zeros(len(recording), dtype=np.int64)
+
+    replay_start = time.perf_counter()
+    for index in range(len(recording)):
+        frame_time, position, events = recording.get_frame(index)
+        if realtime:
+            time.sleep(max(0.0, frame_time - (time.perf_counter() - replay_start)))
+
+        start = time.perf_counter()
+        box.run_logic(events, position)
+        logic_end = time.perf_counter()
+        rects = box.blit_if_necessary(surface, position)
+        blit_end = time.perf_counter()
+
+        logic_times[index] = logic_end - start
+        blit_times[index] = blit_end - logic_end
+        dirty_rects[index] = len(rects)
+        dirty_areas[index] = sum(rect.width * rect.height for rect in rects)
+
+    return ReplayResult(logic_times, blit_times, dirty_rects, dirty_areas)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    parser = argparse.ArgumentParser(description="replay recorded ButtonBox input headlessly")
+    parser.add_argument("recording", help="path of the recording")
+    parser.add_argument("box_factory", help="function creating the box as module:function, called without arguments")
+    parser.add_argument("--realtime", action="store_true", help="keep the recorded timing between frames")
+    arguments = parser.parse_args()
+
+    pygame.init()
+    loaded_recording = load_recording(arguments.recording)
+    window = pygame.display.set_mode((int(loaded_recording.frames["position"][:, 0].max(initial=0))
+                                      + loaded_recording.box_size[0],
+                                      int(loaded_recording.frames["position"][:, 1].max(initial=0))
+                                      + loaded_recording.box_size[1]))
+
+    module_name, function_name = arguments.box_factory.split(":")
+    replayed_box = getattr(importlib.import_module(module_name), function_name)()
+
+    for key, value in replay(loaded_recording, replayed_box, window, arguments.realtime).summary().items():
+        print(f"{key}: {value}")
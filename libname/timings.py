@@ -0,0 +1,27 @@
+"""
+summaries of measured durations shared by the benchmarks and the replays
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def summarise(name: str, timings: list[float] | np.ndarray, **parameters) -> dict:
+    """
+    summarise measured durations
+    :param name: name of the benchmark or replay
+    :param timings: measured durations in seconds
+    :param parameters: parameters of the benchmark to be stored with the result
+    :return: dict with throughput in runs per second and percentiles in milliseconds
+    """
+    timings = np.asarray(timings, dtype=float)
+    total = float(timings.sum())
+    return {"name": name,
+            "parameters": parameters,
+            "runs": int(timings.size),
+            "throughput": timings.size / total if total > 0 else float("inf"),
+            "mean_ms": float(timings.mean() * 1000),
+            "p50_ms": float(np.percentile(timings, 50) * 1000),
+            "p90_ms": float(np.percentile(timings, 90) * 1000),
+            "p99_ms": float(np.percentile(timings, 99) * 1000),
+            "max_ms": float(timings.max() * 1000)}
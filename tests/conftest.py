@@ -0,0 +1,41 @@
+import os
+import sys
+
+# the modules of the library import each other by their plain names:
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "libname"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def window() -> pygame.Surface:
+    pygame.init()
+    return pygame.display.set_mode((800, 600))
+
+
+@pytest.fixture
+def make_texture():
+    generator = np.random.default_rng(0)
+
+    def make_texture(size: int = 32) -> pygame.Surface:
+        texture = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.surfarray.pixels3d(texture)[...] = generator.integers(0, 256, (size, size, 3))
+        pygame.surfarray.pixels_alpha(texture)[...] = 255
+        return texture
+
+    return make_texture
+
+
+def motion(position: tuple[int, int]) -> pygame.Event:
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=position, rel=(0, 0), buttons=(0, 0, 0))
+
+
+def mouse_down(position: tuple[int, int]) -> pygame.Event:
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=position, button=1)
+
+
+def mouse_up(position: tuple[int, int]) -> pygame.Event:
+    return pygame.event.Event(pygame.MOUSEBUTTONUP, pos=position, button=1)
@@ -0,0 +1,29 @@
+import numpy as np
+import pygame
+import pytest
+
+import buttons
+from buttons import ButtonAppearance, ButtonBackgroundAppearance
+
+
+def assert_similar(surface: pygame.Surface, other_surface: pygame.Surface):
+    assert surface.get_size() == other_surface.get_size()
+    assert np.abs(pygame.surfarray.array3d(surface).astype(int) - pygame.surfarray.array3d(other_surface)).max() <= 2
+    assert np.abs(pygame.surfarray.array_alpha(surface).astype(int) -
+                  pygame.surfarray.array_alpha(other_surface)).max() <= 2
+
+
+@pytest.mark.parametrize("appearance", [ButtonAppearance(),
+                                        ButtonAppearance(1, 150, True),
+                                        ButtonAppearance(0.8, None, False, None, False, (200, 100, 50)),
+                                        ButtonAppearance(0.7, 120, True, (ButtonBackgroundAppearance(0.9, 0.3),))])
+def test_batch_rendering_equals_single_rendering(make_texture, appearance):
+    generator = np.random.default_rng(2)
+    textures = [make_texture() for _ in range(buttons.TEXTURE_STACK_LENGTH + 3)]
+    for texture in textures[::2]:
+        pygame.surfarray.pixels_alpha(texture)[...] = generator.integers(0, 256, texture.get_size())
+    # textures without per pixel alpha are blended differently:
+    textures[1] = textures[1].convert()
+
+    for texture, surface in zip(textures, appearance.get_appearance_applied_buttons(textures, 40)):
+        assert_similar(appearance.get_appearance_applied_button(texture, 40), surface)
@@ -0,0 +1,28 @@
+import pytest
+
+import benchmark
+from timings import summarise
+
+
+def test_summarise():
+    summary = summarise("frames", [0.001, 0.002, 0.003, 0.004], grid_size=4)
+    assert summary["parameters"] == {"grid_size": 4}
+    assert summary["runs"] == 4
+    assert summary["throughput"] == pytest.approx(400)
+    assert summary["p50_ms"] == pytest.approx(2.5)
+    assert summary["max_ms"] == pytest.approx(4)
+
+
+def test_compare_results():
+    previous_results = {"results": [summarise("a", [0.001], grid_size=4), summarise("b", [0.001])]}
+    results = {"results": [summarise("a", [0.003], grid_size=4), summarise("a", [0.003], grid_size=16)]}
+    comparison = benchmark.compare_results(results, previous_results)
+    assert [(previous, current) for _, previous, current in comparison] == [(pytest.approx(1), pytest.approx(3))]
+
+
+@pytest.mark.parametrize("bench", [benchmark.bench_terminate_surface, benchmark.bench_blit])
+def test_grid_benchmarks_run(bench):
+    arguments = (4, 3, 20) if bench is benchmark.bench_terminate_surface else (4, 3, 20, 2)
+    results = bench(*arguments)
+    assert results
+    assert all(result["runs"] == 3 and result["parameters"]["grid_size"] == 4 for result in results)
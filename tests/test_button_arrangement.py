@@ -0,0 +1,21 @@
+import array
+
+import numpy as np
+
+from buttons import BaseButton, ButtonBox
+
+
+def test_numpy_passive_buttons(make_texture):
+    box = ButtonBox((2, 2), 40)
+    box.add_button_arrangement("main", (2, 2), tuple(BaseButton(make_texture(), print) for _ in range(4)),
+                               passive_buttons=np.array([True, False, False, True]))
+    arrangement = box.button_arrangements["main"]
+    assert arrangement.passive_button == array.array("b", (1, 0, 0, 1))
+
+    arrangement.set_active(0)
+    arrangement.set_passive(1)
+    assert arrangement.passive_button == array.array("b", (0, 1, 0, 1))
+    arrangement.set_all_passive()
+    assert arrangement.passive_button == array.array("b", (1, 1, 1, 1))
+    arrangement.set_all_active()
+    assert arrangement.passive_button == array.array("b", (0, 0, 0, 0))
@@ -0,0 +1,53 @@
+import numpy as np
+import pygame
+
+from buttons import BaseButton, ButtonBox
+from conftest import motion, mouse_down, mouse_up
+
+
+def create_box(textures: list[pygame.Surface], batch_hit_test_threshold: int | None) -> ButtonBox:
+    box = ButtonBox((4, 4), 30, button_padding_size=6, border_padding_size=9)
+    box.batch_hit_test_threshold = batch_hit_test_threshold
+    box.add_button_arrangement("main", (4, 4), tuple(BaseButton(texture, print) for texture in textures[:14]),
+                               arrangement_pointers=("other",) + (None,) * 13)
+    box.add_button_arrangement("other", (8, 8), tuple(BaseButton(texture, print) for texture in textures),
+                               arrangement_pointers=("main",) + (None,) * 63, viewport_shape=(4, 4))
+    return box
+
+
+def test_batch_hit_test_equals_single_hit_tests(make_texture):
+    box = create_box([make_texture() for _ in range(64)], None)
+    positions = np.random.default_rng(3).integers(-20, box.get_size()[0] + 20, (2000, 2))
+
+    for name in ("main", "other"):
+        box.set_current_arrangement(name)
+        expected = [box.get_index_at_position(position) for position in positions.tolist()]
+        assert box.get_indices_at_positions(positions).tolist() == [-1 if index is None else index
+                                                                     for index in expected]
+
+
+def test_run_logic_with_batch_hit_test_equals_single_hit_tests(make_texture):
+    textures = [make_texture() for _ in range(64)]
+    box = create_box(textures, None)
+    batch_box = create_box(textures, 1)
+    generator = np.random.default_rng(4)
+    positions = generator.integers(0, box.get_size()[0], (400, 2)).tolist()
+    wheel_event = pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-1, flipped=False, touch=False)
+    # clicking the first button switches the arrangement within a frame:
+    first_button = (9 + 15, 9 + 15)
+
+    for frame in range(40):
+        events = [motion(tuple(position)) for position in positions[frame * 10:frame * 10 + 10]]
+        if frame % 3 == 0:
+            events[4:4] = [mouse_down(first_button), mouse_up(first_button), motion(first_button), wheel_event]
+        elif frame % 3 == 1:
+            events[2:2] = [mouse_down(events[1].pos), mouse_up(events[1].pos)]
+
+        box.run_logic(events, (0, 0))
+        batch_box.run_logic(events, (0, 0))
+        arrangement = box.current_button_arrangement
+        batch_arrangement = batch_box.current_button_arrangement
+        assert arrangement.shape == batch_arrangement.shape
+        assert arrangement.hovered_index == batch_arrangement.hovered_index
+        assert arrangement.pressed_index == batch_arrangement.pressed_index
+        assert getattr(arrangement, "scroll_position", None) == getattr(batch_arrangement, "scroll_position", None)
@@ -0,0 +1,91 @@
+import pygame
+
+from buttons import HOVERED_STATE, NORMAL_STATE, PRESSED_STATE, BaseButton, ButtonBox, ButtonBoxManager
+from replay import InputRecorder, replay
+
+
+def finger(event_type: int, finger_id: int, position: tuple[int, int]) -> pygame.Event:
+    width, height = pygame.display.get_window_size()
+    return pygame.event.Event(event_type, touch_id=1, finger_id=finger_id, x=(position[0] + 0.5) / width,
+                              y=(position[1] + 0.5) / height, dx=0.0, dy=0.0, pressure=1.0)
+
+
+def create_box(textures: list[pygame.Surface], calls: list) -> ButtonBox:
+    box = ButtonBox((3, 3), 40, multi_touch=True)
+    box.add_button_arrangement("main", (3, 3), tuple(BaseButton(texture, calls.append, args=(index,))
+                                                     for index, texture in enumerate(textures)))
+    return box
+
+
+def get_cell_center(box: ButtonBox, index: int) -> tuple[int, int]:
+    return (box.border_padding_size + index % 3 * box.combined_button_size + box.button_size // 2,
+            box.border_padding_size + index // 3 * box.combined_button_size + box.button_size // 2)
+
+
+def test_fingers_press_and_release_independently(make_texture):
+    calls = []
+    box = create_box([make_texture() for _ in range(9)], calls)
+    arrangement = box.current_button_arrangement
+
+    box.run_logic([finger(pygame.FINGERDOWN, 0, get_cell_center(box, 0)),
+                   finger(pygame.FINGERDOWN, 1, get_cell_center(box, 5))], (0, 0))
+    assert arrangement.get_button_state(0) == PRESSED_STATE
+    assert arrangement.get_button_state(5) == PRESSED_STATE
+
+    box.run_logic([finger(pygame.FINGERUP, 0, get_cell_center(box, 0))], (0, 0))
+    assert calls == [0]
+    assert arrangement.get_button_state(0) == NORMAL_STATE
+    assert arrangement.get_button_state(5) == PRESSED_STATE
+
+    box.run_logic([finger(pygame.FINGERMOTION, 1, get_cell_center(box, 6))], (0, 0))
+    assert arrangement.get_button_state(6) == HOVERED_STATE
+    # a touch released outside of every button does not call the commands of the button it went down on:
+    outside = (box.get_size()[0] + 10, 10)
+    box.run_logic([finger(pygame.FINGERMOTION, 1, outside), finger(pygame.FINGERUP, 1, outside)], (0, 0))
+    assert calls == [0]
+    assert not arrangement.pointer_pressed_indices and not arrangement.pointer_hovered_indices
+    assert arrangement.get_button_state(5) == NORMAL_STATE and arrangement.get_button_state(6) == NORMAL_STATE
+
+
+def test_manager_routes_every_finger_to_its_box(make_texture):
+    calls = []
+    textures = [make_texture() for _ in range(9)]
+    manager = ButtonBoxManager()
+    left_box = create_box(textures, calls)
+    right_box = create_box(textures, calls)
+    manager.add_box("left", left_box, (0, 0))
+    manager.add_box("right", right_box, (400, 0))
+    right_position = get_cell_center(right_box, 4)
+    right_position = (right_position[0] + 400, right_position[1])
+
+    manager.run_logic([finger(pygame.FINGERDOWN, 0, get_cell_center(left_box, 1)),
+                       finger(pygame.FINGERDOWN, 1, right_position)])
+    assert left_box.current_button_arrangement.pointer_pressed_indices == {(1, 0): 1}
+    assert right_box.current_button_arrangement.pointer_pressed_indices == {(1, 1): 4}
+
+    # the box a touch went down on receives its release outside of the box:
+    manager.run_logic([finger(pygame.FINGERMOTION, 0, right_position),
+                       finger(pygame.FINGERUP, 0, right_position),
+                       finger(pygame.FINGERUP, 1, right_position)])
+    assert calls == [4]
+    assert not left_box.current_button_arrangement.pointer_pressed_indices
+    assert not right_box.current_button_arrangement.pointer_pressed_indices
+
+
+def test_replay_of_touches(make_texture):
+    textures = [make_texture() for _ in range(9)]
+    calls = []
+    box = create_box(textures, calls)
+    recorder = InputRecorder(box)
+    for events in ([finger(pygame.FINGERDOWN, 0, get_cell_center(box, 2)),
+                    finger(pygame.FINGERDOWN, 1, get_cell_center(box, 7))],
+                   [finger(pygame.FINGERUP, 1, get_cell_center(box, 7))],
+                   [finger(pygame.FINGERMOTION, 0, get_cell_center(box, 3))],
+                   [finger(pygame.FINGERMOTION, 0, get_cell_center(box, 2)),
+                    finger(pygame.FINGERUP, 0, get_cell_center(box, 2))]):
+        recorder.run_logic(events, (0, 0))
+    assert calls == [7, 2]
+
+    replayed_calls = []
+    replay(recorder.get_recording(), create_box(textures, replayed_calls), pygame.Surface(box.get_size()))
+    assert replayed_calls == calls
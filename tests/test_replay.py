@@ -0,0 +1,46 @@
+import sys
+
+import pygame
+
+from buttons import BaseButton, ButtonBox
+from conftest import motion, mouse_down, mouse_up
+from replay import InputRecorder, load_recording, replay
+
+
+def create_box(textures: list[pygame.Surface]) -> ButtonBox:
+    box = ButtonBox((3, 3), 40)
+    box.add_button_arrangement("main", (3, 3), tuple(BaseButton(texture, print) for texture in textures))
+    return box
+
+
+def test_replay_round_trip(make_texture, tmp_path):
+    textures = [make_texture() for _ in range(9)]
+    recorded_box = create_box(textures)
+    recorder = InputRecorder(recorded_box)
+    recorded_surface = pygame.Surface(recorded_box.get_size())
+    frames = [[motion((10, 10))], [mouse_down((10, 10))], [mouse_up((10, 10))], [], [motion((60, 100))],
+              [pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=1, flipped=False, touch=False)], [mouse_down((60, 100))]]
+    for events in frames:
+        recorder.run_logic(events, (0, 0))
+        recorded_box.blit_if_necessary(recorded_surface, (0, 0))
+    recorder.save(str(tmp_path / "recording.npz"))
+
+    recording = load_recording(str(tmp_path / "recording.npz"))
+    assert len(recording) == len(frames)
+    for index, events in enumerate(frames):
+        _, position, replayed_events = recording.get_frame(index)
+        assert position == (0, 0)
+        assert [event.type for event in replayed_events] == [event.type for event in events]
+        assert [getattr(event, "pos", None) for event in replayed_events] == \
+               [getattr(event, "pos", None) for event in events]
+
+    replayed_box = create_box(textures)
+    replayed_surface = pygame.Surface(replayed_box.get_size())
+    result = replay(recording, replayed_box, replayed_surface)
+    assert pygame.image.tobytes(replayed_surface, "RGB") == pygame.image.tobytes(recorded_surface, "RGB")
+    assert replayed_box.current_button_arrangement.pressed_index == \
+           recorded_box.current_button_arrangement.pressed_index
+    # summarising a replay must not pull in the benchmarks, which configure SDL on import:
+    sys.modules.pop("benchmark", None)
+    assert result.summary()["runs"] == len(frames)
+    assert "benchmark" not in sys.modules
@@ -0,0 +1,57 @@
+import pygame
+
+from buttons import NORMAL_STATE, BaseButton, ButtonBox, SurfaceCache
+
+
+def create_box(buttons: tuple[BaseButton, ...], button_size: int, surface_cache: SurfaceCache) -> ButtonBox:
+    box = ButtonBox((4, 4), button_size, surface_cache=surface_cache)
+    box.add_button_arrangement("main", (4, 4), buttons)
+    return box
+
+
+def render(box: ButtonBox) -> bytes:
+    surface = pygame.Surface(box.get_size())
+    box.run_logic([], (0, 0))
+    box.blit_if_necessary(surface, (0, 0), True)
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def is_cached(surface_cache: SurfaceCache, button: BaseButton, button_size: int) -> bool:
+    return (button.texture, button.get_appearance_by_state(NORMAL_STATE), button_size) in surface_cache
+
+
+def test_rescale_shows_placeholders_until_rendered(make_texture):
+    buttons = tuple(BaseButton(make_texture(), print) for _ in range(16))
+    surface_cache = SurfaceCache(None)
+    box = create_box(buttons, 40, surface_cache)
+    render(box)
+
+    box.set_button_size(60, 0.0005)
+    first_frame = render(box)
+    arrangement = box.current_button_arrangement
+    assert arrangement.provisional_indices
+    assert first_frame != render(create_box(buttons, 60, SurfaceCache(None)))
+
+    frame = first_frame
+    for _ in range(1000):
+        # the surfaces of the replaced size are evicted once everything is rendered:
+        if not arrangement.provisional_indices and not any(is_cached(surface_cache, button, 40) for button in buttons):
+            break
+        frame = render(box)
+    assert frame == render(create_box(buttons, 60, SurfaceCache(None)))
+    assert not any(is_cached(surface_cache, button, 40) for button in buttons)
+    assert all(is_cached(surface_cache, button, 60) for button in buttons)
+
+
+def test_rescale_keeps_sizes_used_by_other_boxes(make_texture):
+    buttons = tuple(BaseButton(make_texture(), print) for _ in range(16))
+    surface_cache = SurfaceCache(None)
+    box = create_box(buttons, 40, surface_cache)
+    other_box = create_box(buttons, 40, surface_cache)
+    render(box)
+    render(other_box)
+
+    box.set_button_size(60, None)
+    render(box)
+    assert all(is_cached(surface_cache, button, 40) for button in buttons)
+    assert all(is_cached(surface_cache, button, 60) for button in buttons)
@@ -0,0 +1,60 @@
+import pygame
+
+from buttons import BaseButton, ButtonBox
+from conftest import motion
+
+
+def create_box(textures: list[pygame.Surface]) -> ButtonBox:
+    box = ButtonBox((2, 2), 40)
+    box.add_button_arrangement("main", (6, 6), tuple(BaseButton(texture, print) for texture in textures),
+                               viewport_shape=(2, 2))
+    return box
+
+
+def get_cell_center(box: ButtonBox, column: int, row: int) -> tuple[int, int]:
+    return (box.border_padding_size + column * box.combined_button_size + box.button_size // 2,
+            box.border_padding_size + row * box.combined_button_size + box.button_size // 2)
+
+
+def render(box: ButtonBox) -> bytes:
+    surface = pygame.Surface(box.get_size())
+    box.run_logic([], (0, 0))
+    box.blit_if_necessary(surface, (0, 0), True)
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def test_hit_tests_follow_the_scroll_position(make_texture):
+    box = create_box([make_texture() for _ in range(36)])
+    assert box.get_index_at_position(get_cell_center(box, 1, 0)) == 1
+
+    assert box.scroll(1, 2)
+    assert box.get_index_at_position(get_cell_center(box, 0, 0)) == 13
+    assert box.get_index_at_position(get_cell_center(box, 1, 1)) == 20
+    assert box.get_indices_at_positions([get_cell_center(box, 0, 0), get_cell_center(box, 1, 1)]).tolist() == [13, 20]
+
+    # scrolling is limited to the arrangement:
+    box.scroll(100, 100)
+    assert box.current_button_arrangement.scroll_position == (4, 4)
+    assert box.get_index_at_position(get_cell_center(box, 1, 1)) == 35
+    assert not box.scroll(1, 1)
+
+
+def test_wheel_scrolls_and_updates_the_hovered_button(make_texture):
+    box = create_box([make_texture() for _ in range(36)])
+    box.run_logic([motion(get_cell_center(box, 1, 1))], (0, 0))
+    assert box.current_button_arrangement.hovered_index == 7
+
+    box.run_logic([pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-1, flipped=False, touch=False)], (0, 0))
+    assert box.current_button_arrangement.scroll_position == (0, 1)
+    assert box.current_button_arrangement.hovered_index == 13
+
+
+def test_scrolled_surface_equals_a_fresh_render(make_texture):
+    textures = [make_texture() for _ in range(36)]
+    box = create_box(textures)
+    render(box)
+    for columns, rows in ((1, 0), (0, 1), (2, 3), (-1, -2), (3, 3)):
+        box.scroll(columns, rows)
+        reference_box = create_box(textures)
+        reference_box.current_button_arrangement.scroll_to(*box.current_button_arrangement.scroll_position)
+        assert render(box) == render(reference_box)
@@ -0,0 +1,29 @@
+import pygame
+
+from buttons import BaseButton, ButtonBox, SurfaceCache
+from conftest import motion
+
+
+def test_caches_are_resolved_when_arrangements_are_added(make_texture):
+    box = ButtonBox((2, 2), 40)
+    cache = SurfaceCache(None)
+    box.add_button_arrangement("main", (2, 2), tuple(BaseButton(make_texture(), print, surface_cache=cache)
+                                                     for _ in range(4)))
+    statistics = box.enable_statistics()
+    get_surface_caches = statistics.get_surface_caches
+    calls = []
+    statistics.get_surface_caches = lambda: calls.append(None) or get_surface_caches()
+
+    surface = pygame.Surface(box.get_size())
+    for position in ((10, 10), (60, 10), (10, 60)):
+        box.run_logic([motion(position)], (0, 0))
+        box.blit_if_necessary(surface, (0, 0))
+    assert not calls
+    assert statistics.surface_caches == (cache,)
+    assert sum(frame.cache_hits + frame.cache_misses for frame in statistics.history) > 0
+
+    other_cache = SurfaceCache(None)
+    box.add_button_arrangement("other", (2, 2), tuple(BaseButton(make_texture(), print, surface_cache=other_cache)
+                                                      for _ in range(4)))
+    assert len(calls) == 1
+    assert set(statistics.surface_caches) == {cache, other_cache}
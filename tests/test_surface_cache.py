@@ -0,0 +1,62 @@
+import numpy as np
+import pygame
+
+from buttons import BaseButton, ButtonAppearance, ButtonBackgroundAppearance, ButtonBox, SurfaceAtlas, SurfaceCache
+from conftest import motion
+
+
+def render(box: ButtonBox, events: list) -> pygame.Surface:
+    surface = pygame.Surface(box.get_size())
+    surface.fill((0, 0, 0))
+    box.run_logic(events, (0, 0))
+    box.blit_if_necessary(surface, (0, 0))
+    return surface
+
+
+def test_atlas_eviction_inside_a_batch_draws_every_button(make_texture):
+    buttons = tuple(BaseButton(make_texture(), print) for _ in range(16))
+    box = ButtonBox((4, 4), 40, surface_cache=SurfaceCache(20000, SurfaceAtlas((128, 128))))
+    box.add_button_arrangement("main", (4, 4), buttons)
+    reference_box = ButtonBox((4, 4), 40, surface_cache=SurfaceCache(None))
+    reference_box.add_button_arrangement("main", (4, 4), buttons)
+
+    assert pygame.image.tobytes(render(box, []), "RGB") == pygame.image.tobytes(render(reference_box, []), "RGB")
+
+
+def test_atlas_eviction_over_many_frames(make_texture):
+    hovered_appearance = ButtonAppearance(1.2, background_appearance=ButtonBackgroundAppearance(colour=(9, 9, 9)))
+    buttons = tuple(BaseButton(make_texture(), print, hovered_appearance=hovered_appearance) for _ in range(64))
+    cache = SurfaceCache(300000, SurfaceAtlas((128, 128)))
+    box = ButtonBox((8, 8), 40, surface_cache=cache)
+    box.add_button_arrangement("main", (8, 8), buttons)
+    reference_box = ButtonBox((8, 8), 40, surface_cache=SurfaceCache(None))
+    reference_box.add_button_arrangement("main", (8, 8), buttons)
+
+    generator = np.random.default_rng(1)
+    for position in generator.integers(0, 400, (60, 2)).tolist():
+        events = [motion(tuple(position))]
+        assert (pygame.image.tobytes(render(box, events), "RGB") ==
+                pygame.image.tobytes(render(reference_box, events), "RGB"))
+        assert cache.cached_bytes <= cache.byte_budget
+
+
+def test_atlas_pages_are_counted_and_dropped(make_texture):
+    atlas = SurfaceAtlas((128, 128))
+    cache = SurfaceCache(None, atlas)
+    for index in range(6):
+        cache.add(index, make_texture(40))
+
+    assert cache.cached_bytes == atlas.page_bytes == len(atlas.pages) * 128 * 128 * 4
+    cache.clear()
+    assert atlas.pages == [] and cache.cached_bytes == 0
+
+
+def test_deferred_eviction_keeps_surfaces(make_texture):
+    cache = SurfaceCache(40 * 40 * 4)
+    cache.defer_eviction()
+    cache.add("first", make_texture(40))
+    cache.add("second", make_texture(40))
+    assert len(cache) == 2
+
+    cache.resume_eviction()
+    assert "first" not in cache and "second" in cache